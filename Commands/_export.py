@@ -0,0 +1,101 @@
+"""Streaming CSV/JSON writers for tournament result exports."""
+from __future__ import annotations
+
+import csv
+import io
+import math
+import tempfile
+from typing import IO, Iterator
+
+import json_codec
+from standings import ScoreMatrix, compute_standings, map_ranks, standings_options
+
+FORMATS = ("csv", "json")
+
+COLUMNS = (
+    "player",
+    "beatleaderId",
+    "overallRank",
+    "mapId",
+    "song",
+    "characteristic",
+    "difficulty",
+    "score",
+    "accuracy",
+    "rank",
+)
+
+# Exports smaller than this stay in memory; larger ones spill to a temporary file
+SPOOL_BYTES = 1024 * 1024
+
+
+def _number(value: float) -> float | int | None:
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() else round(value, 4)
+
+
+def iter_result_rows(tournament: dict, matrix: ScoreMatrix) -> Iterator[dict]:
+    """One row per (player, map) cell, players in standings order, built as it is consumed."""
+    players = tournament.get("players") or {}
+    maps_config = tournament.get("maps") or {}
+    standings = compute_standings(matrix, *standings_options(tournament))
+    overall = {player: place for place, (player, _, _) in enumerate(standings, start=1)}
+    ranked = set(overall)
+    order = [player for player, _, _ in standings]
+    order.extend(player for player in matrix.players if player not in ranked)
+
+    ranks = map_ranks(matrix.scores)
+    rows = {player: row for row, player in enumerate(matrix.players)}
+    for player in order:
+        row = rows[player]
+        player_data = players.get(player) or {}
+        for column, map_id in enumerate(matrix.maps):
+            map_config = maps_config.get(map_id) or {}
+            yield {
+                "player": player_data.get("beatleaderUsername", player),
+                "beatleaderId": player_data.get("beatleaderId"),
+                "overallRank": overall.get(player),
+                "mapId": map_id,
+                "song": map_config.get("songName") or map_config.get("name"),
+                "characteristic": map_config.get("characteristic"),
+                "difficulty": map_config.get("difficulty"),
+                "score": _number(matrix.scores[row, column]),
+                "accuracy": _number(matrix.accuracy[row, column]),
+                "rank": _number(ranks[row, column]),
+            }
+
+
+def write_csv(rows: Iterator[dict], file: IO[bytes]) -> None:
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="", write_through=True)
+    writer = csv.DictWriter(text, fieldnames=COLUMNS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow({key: "" if value is None else value for key, value in row.items()})
+    # Hand the underlying file back to the caller open
+    text.detach()
+
+
+def write_json(rows: Iterator[dict], file: IO[bytes]) -> None:
+    file.write(b"[")
+    separator = b"\n  "
+    for row in rows:
+        file.write(separator)
+        file.write(json_codec.dumps(row))
+        separator = b",\n  "
+    file.write(b"\n]\n")
+
+
+def export_results(tournament: dict, matrix: ScoreMatrix, fmt: str) -> IO[bytes]:
+    """Write the results table row by row and return the file, rewound for upload."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'.")
+    file = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    rows = iter_result_rows(tournament, matrix)
+    if fmt == "csv":
+        write_csv(rows, file)
+    else:
+        write_json(rows, file)
+    file.seek(0)
+    return file
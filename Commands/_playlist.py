@@ -0,0 +1,192 @@
+"""Streaming reader for .bplist playlist files."""
+from __future__ import annotations
+
+import re
+from typing import Any, AsyncIterator
+
+import json_codec
+
+MAX_PLAYLIST_BYTES = 16 * 1024 * 1024
+MAX_SONG_BYTES = 64 * 1024
+MAX_FIELD_BYTES = 4 * 1024
+
+# Top-level fields whose values are decoded; everything else (notably the
+# base64 cover `image`) is scanned past without being kept.
+CAPTURED_FIELDS = ("playlistTitle", "playlistAuthor")
+
+_WHITESPACE = b" \t\r\n"
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_NESTED_SPECIAL = re.compile(rb'["\\{}\[\]]')
+_SCALAR_END = re.compile(rb"[,}\]\s]")
+
+
+class PlaylistError(ValueError):
+    """The playlist is malformed or exceeds a size limit."""
+
+
+class _ByteStream:
+    def __init__(self, chunks: AsyncIterator[bytes], max_bytes: int) -> None:
+        self._chunks = chunks
+        self._max_bytes = max_bytes
+        self._total = 0
+        self._buffer = b""
+        self._pos = 0
+
+    async def _more(self) -> bool:
+        try:
+            chunk = await anext(self._chunks)
+        except StopAsyncIteration:
+            return False
+        self._total += len(chunk)
+        if self._total > self._max_bytes:
+            raise PlaylistError(f"Playlist exceeds the {self._max_bytes // 1024} KiB size limit.")
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    async def peek(self) -> int:
+        """Return the next non-whitespace byte without consuming it, or -1 at end of input."""
+        while True:
+            while self._pos < len(self._buffer):
+                byte = self._buffer[self._pos]
+                if byte not in _WHITESPACE:
+                    return byte
+                self._pos += 1
+            if not await self._more():
+                return -1
+
+    async def take(self) -> int:
+        byte = await self.peek()
+        if byte != -1:
+            self._pos += 1
+        return byte
+
+    async def expect(self, expected: bytes) -> None:
+        byte = await self.take()
+        if byte != expected[0]:
+            found = "end of file" if byte == -1 else repr(chr(byte))
+            raise PlaylistError(f"Invalid playlist JSON: expected {expected.decode()!r}, found {found}.")
+
+    async def read_value(self, *, limit: int | None) -> bytes | None:
+        """
+        Consume one JSON value. Returns its raw bytes when `limit` is given,
+        otherwise skips it without keeping any of it.
+        """
+        captured = bytearray() if limit is not None else None
+
+        def _keep(data: bytes) -> None:
+            if captured is None:
+                return
+            captured.extend(data)
+            if len(captured) > limit:
+                raise PlaylistError("Playlist entry is too large.")
+
+        first = await self.peek()
+        if first == -1:
+            raise PlaylistError("Invalid playlist JSON: unexpected end of file.")
+
+        if first not in b'"{[':
+            # Number, true, false or null
+            while True:
+                match = _SCALAR_END.search(self._buffer, self._pos)
+                if match is not None:
+                    _keep(self._buffer[self._pos:match.start()])
+                    self._pos = match.start()
+                    break
+                _keep(self._buffer[self._pos:])
+                self._pos = len(self._buffer)
+                if not await self._more():
+                    break
+            return bytes(captured) if captured is not None else None
+
+        depth = 0
+        in_string = False
+        escaped = False
+        while True:
+            if self._pos >= len(self._buffer) and not await self._more():
+                raise PlaylistError("Invalid playlist JSON: unexpected end of file.")
+            if escaped:
+                _keep(self._buffer[self._pos:self._pos + 1])
+                self._pos += 1
+                escaped = False
+                continue
+            pattern = _STRING_SPECIAL if in_string else _NESTED_SPECIAL
+            match = pattern.search(self._buffer, self._pos)
+            if match is None:
+                _keep(self._buffer[self._pos:])
+                self._pos = len(self._buffer)
+                continue
+            end = match.start() + 1
+            _keep(self._buffer[self._pos:end])
+            self._pos = end
+            char = match.group()
+            if char == b"\\":
+                escaped = True
+            elif char == b'"':
+                in_string = not in_string
+                if not in_string and depth == 0:
+                    break
+            elif char in (b"{", b"["):
+                depth += 1
+            elif char in (b"}", b"]"):
+                depth -= 1
+                if depth == 0:
+                    break
+        return bytes(captured) if captured is not None else None
+
+
+def _decode(raw: bytes) -> Any:
+    try:
+        return json_codec.loads(raw)
+    except ValueError as exc:
+        raise PlaylistError(f"Invalid playlist JSON: {exc}") from exc
+
+
+async def iter_playlist(
+    chunks: AsyncIterator[bytes], *, max_bytes: int = MAX_PLAYLIST_BYTES
+) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Parse a .bplist from a stream of byte chunks.
+
+    Yields ("song", dict) for each entry of `songs` as soon as it has been
+    read, and (field, value) for the fields in CAPTURED_FIELDS. Other fields
+    are skipped without being buffered, so memory use does not depend on the
+    playlist size. Raises PlaylistError for malformed or oversized input.
+    """
+    stream = _ByteStream(chunks, max_bytes)
+    if await stream.peek() == 0xEF:
+        # UTF-8 byte order mark
+        for _ in range(3):
+            await stream.take()
+    await stream.expect(b"{")
+    if await stream.peek() == ord("}"):
+        return
+
+    while True:
+        key = _decode(await stream.read_value(limit=MAX_FIELD_BYTES))
+        await stream.expect(b":")
+
+        if key == "songs":
+            await stream.expect(b"[")
+            if await stream.peek() == ord("]"):
+                await stream.take()
+            else:
+                while True:
+                    song = _decode(await stream.read_value(limit=MAX_SONG_BYTES))
+                    if isinstance(song, dict):
+                        yield "song", song
+                    separator = await stream.take()
+                    if separator == ord("]"):
+                        break
+                    if separator != ord(","):
+                        raise PlaylistError("Invalid playlist JSON: expected ',' or ']' in songs.")
+        elif key in CAPTURED_FIELDS:
+            yield key, _decode(await stream.read_value(limit=MAX_FIELD_BYTES))
+        else:
+            await stream.read_value(limit=None)
+
+        separator = await stream.take()
+        if separator == ord("}"):
+            return
+        if separator != ord(","):
+            raise PlaylistError("Invalid playlist JSON: expected ',' or '}'.")
@@ -10,7 +10,7 @@ Get information about your BeatLeader account.
 async def me_command(interaction: discord.Interaction) -> None:
     await interaction.response.defer(ephemeral=True, thinking=True)
 
-    user = await interaction.client.beatleader.get_player_by_discord_id(
+    user = await interaction.client.identities.get_by_discord_id(
         str(interaction.user.id)
     )
 
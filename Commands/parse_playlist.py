@@ -1,82 +1,10 @@
+import aiohttp
 import discord
 from discord import app_commands
-import json
-from datetime import datetime
 from ._helpers import _command_mentions
-
-class TournamentsFile:
-    FILE_PATH = "tournaments.json"
-
-    @staticmethod
-    def _load() -> list[dict]:
-        try:
-            with open(TournamentsFile.FILE_PATH, "r", encoding="utf-8") as file:
-                data = file.read().strip()
-                if not data:
-                    return []
-                return json.loads(data)
-        except (FileNotFoundError, json.JSONDecodeError):
-            with open(TournamentsFile.FILE_PATH, "w", encoding="utf-8") as file:
-                json.dump([], file)
-            return []
-
-    @staticmethod
-    def _write(tournaments: list[dict]) -> None:
-        with open(TournamentsFile.FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(tournaments, file, indent=4)
-    
-    @staticmethod
-    def get_tournaments(active: bool = True) -> list[dict]:
-        tournaments = TournamentsFile._load()
-        if not active:
-            return tournaments
-
-        now = datetime.now().timestamp()
-        active_tournaments: list[dict] = []
-        for tournament in tournaments:
-            try:
-                start = float(tournament.get("startDate", 0))
-                end = float(tournament.get("endDate", 0))
-            except (TypeError, ValueError):
-                continue
-            if start <= now <= end:
-                active_tournaments.append(tournament)
-        return active_tournaments
-
-    @staticmethod
-    def get_tournament(name: str) -> dict:
-        tournaments = TournamentsFile._load()
-        for tournament in tournaments:
-            if tournament.get("name") == name:
-                return tournament
-        raise ValueError(f"Tournament '{name}' not found.")
-
-    @staticmethod
-    def save_tournament(
-        name: str,
-        maps: dict[str, dict[str, str]] | None = None,
-        players: dict[dict[str, str]] | None = None,
-    ) -> None:
-        tournaments = TournamentsFile._load()
-        for index, existing in enumerate(tournaments):
-            if existing.get("name") == name:
-                updated = existing.copy()
-                if maps is not None:
-                    updated["maps"] = maps
-                if players is not None:
-                    updated["players"] = players
-                tournaments[index] = updated
-                break
-        else:
-            tournaments.append(
-                {
-                    "name": name,
-                    "maps": maps or {},
-                    "players": players or {},
-                }
-            )
-        TournamentsFile._write(tournaments)
-
+from ._playlist import MAX_PLAYLIST_BYTES, PlaylistError, iter_playlist
+from .tournaments import TournamentsFile
+from beatsaver import summarize_map
 
 class TournamentCreateModal(discord.ui.Modal, title='Create Tournament'):
     def __init__(self, name=None, maps=None) -> None:
@@ -91,7 +19,7 @@ class TournamentCreateModal(discord.ui.Modal, title='Create Tournament'):
         self.maps = maps or {}
     
     async def on_submit(self, interaction: discord.Interaction):
-        TournamentsFile.save_tournament(
+        TournamentsFile.for_guild(interaction.guild_id).save_tournament(
             name=self.name.value,
             maps=self.maps,
         )
@@ -116,6 +44,9 @@ class MapSelect(discord.ui.Select):
             for level_id, info in self.maps.items():
                 if not level_id:
                     continue
+                # Discord caps selects at 25 options; larger playlists use ALL
+                if len(options) >= 25:
+                    break
                 name = info.get("name") or "Unknown Song"
                 difficulty = info.get("difficulty")
                 label = name
@@ -181,35 +112,74 @@ description = """
 Parse a playlist and display its contents.
 """
 
+async def _attachment_chunks(file: discord.Attachment, chunk_size: int = 64 * 1024):
+    async with aiohttp.ClientSession() as session:
+        async with session.get(file.url) as response:
+            response.raise_for_status()
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
+
 @app_commands.command(name="parse_playlist", description=description)
+@app_commands.guild_only()
 async def parse_playlist_command(interaction: discord.Interaction, file: discord.Attachment) -> None:
     await interaction.response.defer(ephemeral=True, thinking=True)
 
-    playlist_data = await file.read()
-    playlist_json = json.loads(playlist_data)
+    if file.size > MAX_PLAYLIST_BYTES:
+        await interaction.followup.send(
+            f"Playlist is too large ({file.size // 1024} KiB, limit {MAX_PLAYLIST_BYTES // 1024} KiB).",
+            ephemeral=True,
+        )
+        return
+
     embed = discord.Embed()
-    embed.title = playlist_json.get("playlistTitle", "Playlist")
-    embed.description = f"**By {playlist_json.get("playlistAuthor", "Unknown Author")}**"
     embed.color = discord.Color.blurple()
+    title = "Playlist"
+    author = "Unknown Author"
     maps = {}
-    for song in playlist_json.get("songs", []):
-        song_name = song.get("songName", "Unknown Song")
-        song_author = song.get("levelAuthorName", "Unknown Author")
-        difficulty = song.get("difficulties", "Unknown Difficulty")[0]
-        hash = song.get("hash", "Unknown hash")
-        map_id = await interaction.client.beatsaver.get_map_by_hash(hash)
-        level_id = map_id.get("id", "Unknown ID") if map_id else ""
-        song_url = f"https://beatsaver.com/maps/{level_id}" if level_id else "https://beatsaver.com/"
-        embed.add_field(name=f'{song_name}', 
-                        value=f"Author: {song_author}\nDifficulty: {difficulty['name']}\n[Link]({song_url})", 
-                        inline=True)
-        maps[level_id] = {
-            "name": song_name,
-            "author": song_author,
-            "characteristic": difficulty['characteristic'],
-            "difficulty": difficulty['name'],
-            "hash": hash,
-        }
+    song_count = 0
+    try:
+        async for kind, value in iter_playlist(_attachment_chunks(file)):
+            if kind == "playlistTitle":
+                title = value
+                continue
+            if kind == "playlistAuthor":
+                author = value
+                continue
+
+            song = value
+            song_count += 1
+            song_name = song.get("songName", "Unknown Song")
+            song_author = song.get("levelAuthorName", "Unknown Author")
+            difficulty = song.get("difficulties", "Unknown Difficulty")[0]
+            hash = song.get("hash", "Unknown hash")
+            map_id = await interaction.client.beatsaver.get_map_by_hash(hash)
+            level_id = map_id.get("id", "Unknown ID") if map_id else ""
+            song_url = f"https://beatsaver.com/maps/{level_id}" if level_id else "https://beatsaver.com/"
+            # Discord allows at most 25 fields per embed
+            if song_count <= 25:
+                embed.add_field(name=f'{song_name}',
+                                value=f"Author: {song_author}\nDifficulty: {difficulty['name']}\n[Link]({song_url})",
+                                inline=True)
+            maps[level_id] = {
+                "name": song_name,
+                "author": song_author,
+                "characteristic": difficulty['characteristic'],
+                "difficulty": difficulty['name'],
+                "hash": hash,
+            }
+            if map_id:
+                maps[level_id].update(
+                    summarize_map(map_id, hash, difficulty['name'], difficulty['characteristic'])
+                )
+    except PlaylistError as exc:
+        await interaction.followup.send(f"Could not read the playlist: {exc}", ephemeral=True)
+        return
+
+    embed.title = title
+    embed.description = f"**By {author}**"
+    if song_count > 25:
+        embed.description += f"\nShowing 25 of {song_count} songs."
     view = TournamentView(maps=maps)
 
     await interaction.followup.send(embed=embed, view=view, ephemeral=True)
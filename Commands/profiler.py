@@ -0,0 +1,145 @@
+import asyncio
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Literal
+
+import discord
+from discord import app_commands
+
+
+description = """
+Profile the running bot for a number of seconds and attach the report.
+"""
+
+_profiling_lock = asyncio.Lock()
+
+
+class StackSampler(threading.Thread):
+    """Periodically sample the stack of another thread and count the functions on it."""
+
+    def __init__(self, thread_id: int, interval: float = 0.005) -> None:
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.cumulative: Counter[str] = Counter()
+        self.own: Counter[str] = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.own[_describe(frame)] += 1
+            seen: set[str] = set()
+            while frame is not None:
+                seen.add(_describe(frame))
+                frame = frame.f_back
+            self.cumulative.update(seen)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def report(self, limit: int) -> str:
+        lines = [f"{self.samples} samples every {self.interval * 1000:.0f} ms", ""]
+        for title, counter in (("Cumulative", self.cumulative), ("Own", self.own)):
+            lines.append(f"{title}:")
+            for name, count in counter.most_common(limit):
+                share = count / self.samples * 100 if self.samples else 0.0
+                lines.append(f"{share:6.1f}%  {count:6d}  {name}")
+            lines.append("")
+        return "\n".join(lines)
+
+
+def _describe(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
+
+
+def _tracemalloc_report(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int) -> str:
+    # Leave out the profiler's own bookkeeping
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    before = before.filter_traces(filters)
+    after = after.filter_traces(filters)
+    lines = ["Top allocation growth by line:"]
+    for stat in after.compare_to(before, "lineno")[:limit]:
+        lines.append(str(stat))
+    return "\n".join(lines)
+
+
+@app_commands.command(name="profiler", description=description)
+@app_commands.checks.has_permissions(administrator=True)
+@app_commands.describe(
+    seconds="How long to profile for (1-300)",
+    mode="sampling: low overhead stack samples; deterministic: cProfile of every call",
+    top="Number of functions and allocation lines to include",
+)
+async def profiler_command(
+    interaction: discord.Interaction,
+    seconds: app_commands.Range[int, 1, 300] = 30,
+    mode: Literal["sampling", "deterministic"] = "sampling",
+    top: app_commands.Range[int, 5, 100] = 30,
+) -> None:
+    if _profiling_lock.locked():
+        await interaction.response.send_message("A profiling session is already running.", ephemeral=True)
+        return
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    async with _profiling_lock:
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+
+        profile = cProfile.Profile() if mode == "deterministic" else None
+        sampler = StackSampler(threading.get_ident()) if profile is None else None
+        started = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        else:
+            sampler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            if profile is not None:
+                profile.disable()
+            else:
+                sampler.stop()
+        elapsed = time.perf_counter() - started
+
+        after = tracemalloc.take_snapshot()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+    if profile is not None:
+        output = io.StringIO()
+        pstats.Stats(profile, stream=output).sort_stats("cumulative").print_stats(top)
+        cpu_report = output.getvalue()
+    else:
+        cpu_report = sampler.report(top)
+
+    report = "\n\n".join(
+        [
+            f"{mode.capitalize()} profile over {elapsed:.1f} s",
+            cpu_report,
+            _tracemalloc_report(before, after, top),
+        ]
+    )
+    file = discord.File(
+        io.BytesIO(report.encode("utf-8")),
+        filename=f"profile-{int(time.time())}.txt",
+    )
+    await interaction.followup.send(f"Profiled for {elapsed:.1f} s ({mode}).", file=file, ephemeral=True)
+
+
+def setup(bot: discord.Client) -> None:
+    bot.tree.add_command(profiler_command)
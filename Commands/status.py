@@ -34,6 +34,20 @@ def new_embed(client: discord.Client) -> discord.Embed:
     online_since = dt.datetime.fromtimestamp(start_timestamp, tz=dt.timezone.utc)
 
     embed.add_field(name="Latency", value=f"{latency_ms:.1f} ms", inline=False)
+    loop_monitor = getattr(client, "loop_monitor", None)
+    if loop_monitor is not None:
+        lag = loop_monitor.percentiles()
+        embed.add_field(
+            name="Event Loop Lag",
+            value=(
+                f"p50 {lag['p50'] * 1000:.1f} ms · p99 {lag['p99'] * 1000:.1f} ms · "
+                f"max {lag['max'] * 1000:.1f} ms\n{loop_monitor.blocked_count} blocking stalls"
+            ),
+            inline=False,
+        )
+    memory_report = getattr(client, "memory_report", None)
+    if memory_report is not None:
+        embed.add_field(name="Memory", value=memory_report.summary(), inline=False)
     embed.add_field(
         name="Online Since",
         value=discord.utils.format_dt(online_since, style="R"),
@@ -1,9 +1,30 @@
+import asyncio
+import copy
+import functools
+import hashlib
+import logging
+import os
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Iterator
+
 import discord
 from discord import app_commands
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
+from ._export import export_results
 from ._helpers import get_command_mentions
+from beatsaver import summarize_map
+import json_codec
+from standings import METHODS, ScoreMatrix, compute_standings, standings_options
+from prefix_index import PrefixIndex
+from interval_index import IntervalIndex
+from guild_data import GuildData
+from leaderboard_cache import CachedLeaderboard
+from warmup import CacheWarmer
+
+log = logging.getLogger(__name__)
+
+
 def _discord_timestamp(value: int | float | str | None, style: str = "F") -> str:
     try:
         return f"<t:{int(value)}:{style}>"
@@ -18,21 +39,70 @@ def _set_leaderboard_refresh_footer(embed: discord.Embed) -> None:
     embed.set_footer(text="Last refreshed")
 
 
-async def build_tournaments_embed(interaction: discord.Interaction, tournaments: list[dict]) -> discord.Embed:
+def _format_age(seconds: float) -> str:
+    seconds = max(0, int(seconds))
+    if seconds < 60:
+        return f"{seconds} s"
+    if seconds < 3600:
+        return f"{seconds // 60} min"
+    return f"{seconds // 3600} h {seconds % 3600 // 60} min"
+
+
+def _label_leaderboard(entry: CachedLeaderboard, *, updating: bool = False) -> discord.Embed:
+    """A copy of a cached leaderboard whose footer and timestamp show when its scores were fetched."""
+    embed = entry.embed.copy()
+    embed.timestamp = datetime.fromtimestamp(entry.computed_at, tz=timezone.utc)
+    if updating:
+        embed.set_footer(text=f"Scores from {_format_age(entry.age())} ago · updating")
+    else:
+        embed.set_footer(text="Last refreshed")
+    return embed
+
+
+# Seconds a leaderboard refresh may take before the message is switched to its loading state
+LEADERBOARD_LOADING_THRESHOLD = 1.5
+
+# Discord allows at most 25 select options and 25 embed fields
+PAGE_SIZE = 25
+
+
+def _embed_fingerprint(embed: discord.Embed) -> str:
+    """Hash the visible content of an embed, ignoring the refresh footer and timestamp."""
+    payload = {
+        "title": embed.title or "",
+        "description": embed.description or "",
+        "colour": embed.colour.value if embed.colour else None,
+        "fields": [(field.name or "", field.value or "", field.inline) for field in embed.fields],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _page_count(total: int) -> int:
+    return max(1, -(-total // PAGE_SIZE))
+
+
+async def build_tournaments_embed(
+    interaction: discord.Interaction, tournaments: list[dict], page: int = 0, archived: bool = False
+) -> discord.Embed:
+    title = "Finished tournaments" if archived else "Scheduled tournaments overview"
     if not tournaments:
-        return discord.Embed(
-            title="Scheduled tournaments overview",
-            description=f"No tournaments registered. Use {get_command_mentions('parse_playlist')} to create one.",
-            colour=discord.Color.blurple(),
-        )
+        if archived:
+            description = "No finished tournaments yet."
+        else:
+            description = f"No tournaments registered. Use {get_command_mentions('parse_playlist')} to create one."
+        return discord.Embed(title=title, description=description, colour=discord.Color.blurple())
 
     embed = discord.Embed(
-        title="Scheduled tournaments overview",
+        title=title,
         description="",
         colour=discord.Color.blurple(),
     )
     
-    for tournament in tournaments:
+    pages = _page_count(len(tournaments))
+    if pages > 1:
+        embed.set_footer(text=f"Page {page + 1} of {pages} · {len(tournaments)} tournaments")
+
+    for tournament in tournaments[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]:
         players = tournament.get("players", {})
         numPlayers = len(players)
         numMaps = len(tournament.get("maps", []))
@@ -57,8 +127,165 @@ async def build_tournaments_embed(interaction: discord.Interaction, tournaments:
     return embed
 
 
+def _format_standings(tournament: dict, matrix: ScoreMatrix, players: dict) -> str:
+    method, best_n = standings_options(tournament)
+    standings = compute_standings(matrix, method, best_n)
+    if not standings:
+        return "No scores recorded."
+
+    def _value(value: float) -> str:
+        if method == "points":
+            return f"{value:.0f} pts"
+        if method == "average":
+            return f"{value:.2f}%"
+        return f"{value:.2f}"
+
+    rows = [
+        (f"{place}.", str(players[key].get("beatleaderUsername", "Unknown")), _value(value), f"{played} maps")
+        for place, (key, value, played) in enumerate(standings, start=1)
+    ]
+    widths = [max(len(row[column]) for row in rows) for column in range(4)]
+    lines: list[str] = []
+    length = 0
+    for place, name, value, played in rows:
+        line = (
+            f"{place.rjust(widths[0])} {name.ljust(widths[1])}  "
+            f"{value.rjust(widths[2])}  {played.rjust(widths[3])}"
+        )
+        # Embed field values are capped at 1024 characters, including the code fence.
+        if length + len(line) + 1 > 1000:
+            break
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+async def _backfill_map_metadata(client: discord.Client, tournament: dict) -> None:
+    """Fetch and store BeatSaver metadata for maps saved before it was denormalized at creation."""
+    maps_config = tournament.get("maps") or {}
+    missing = [
+        map_id
+        for map_id, map_config in maps_config.items()
+        if map_id and "maxScore" not in (map_config or {})
+    ]
+    if not missing:
+        return
+
+    updated = False
+    for offset in range(0, len(missing), 50):
+        batch = missing[offset:offset + 50]
+        data = await client.beatsaver.get_maps_by_ids(batch)
+        for map_id in batch:
+            map_doc = (data or {}).get(map_id)
+            if not map_doc:
+                continue
+            map_config = maps_config[map_id]
+            map_config.update(
+                summarize_map(
+                    map_doc,
+                    map_config.get("hash", ""),
+                    map_config.get("difficulty", "Unknown"),
+                    map_config.get("characteristic", "Unknown"),
+                )
+            )
+            updated = True
+
+    if updated:
+        TournamentsFile.for_guild(tournament.get("guildId")).save_tournament(
+            name=tournament.get("name", ""), maps=maps_config
+        )
+
+
 async def build_tournament_detail_embed(
     interaction: discord.Interaction, tournament: dict, *, loading: bool = False
+) -> discord.Embed:
+    return await _render_tournament_detail_embed(interaction.client, tournament, loading=loading)
+
+
+async def _fetch_score(
+    client: discord.Client, player_data: dict, map_config: dict
+) -> tuple[float | int | None, float | None]:
+    """A player's (score, accuracy percent) on a map, from the live feed snapshot or BeatLeader."""
+    live_scores = client.live_scores
+    score_data = None
+    if live_scores is not None:
+        score_data = live_scores.get(player_data.get("beatleaderId"), map_config)
+    if score_data is None:
+        try:
+            score_data = await client.beatleader.get_player_score_with_accuracy(player_data, map_config)
+        except Exception:
+            score_data = None
+        else:
+            if live_scores is not None:
+                live_scores.seed(player_data.get("beatleaderId"), map_config, score_data)
+    if score_data is None:
+        return None, None
+
+    score_value = score_data.get("score")
+    # If BeatLeader accuracy is not present, derive percentage from BeatSaver maxScore
+    bl_accuracy = score_data.get("accuracy")
+    max_score_for_map = map_config.get("maxScore")
+    if isinstance(bl_accuracy, (int, float)):
+        accuracy_value = float(bl_accuracy)
+    elif isinstance(score_value, (int, float)) and isinstance(max_score_for_map, (int, float)) and max_score_for_map > 0:
+        accuracy_value = (score_value / max_score_for_map) * 100.0
+    else:
+        accuracy_value = None
+    return score_value, accuracy_value
+
+
+def _scored_maps(maps_config: dict) -> Iterator[tuple[str, dict]]:
+    """Maps in playlist order that have BeatSaver metadata; the others are not scored or shown."""
+    for map_id, map_config in maps_config.items():
+        if (map_config or {}).get("key"):
+            yield map_id, map_config
+
+
+async def _fetch_map_scores(
+    client: discord.Client, players: dict, map_config: dict
+) -> list[tuple[str, float | int | None, float | None]]:
+    """(player key, score, accuracy percent) for every player on one map."""
+    entries = []
+    for player_key, player_data in players.items():
+        score_value, accuracy_value = await _fetch_score(client, player_data, map_config)
+        entries.append((player_key, score_value, accuracy_value))
+    return entries
+
+
+async def _iter_map_scores(
+    client: discord.Client, tournament: dict, matrix: ScoreMatrix, *, fetch: bool = True
+) -> AsyncIterator[tuple[str, dict, list[tuple[str, float | int | None, float | None]]]]:
+    """
+    (map id, map config, entries) for each scored map, with the entries also
+    set in `matrix`. Backfills map metadata and registers the tournament with
+    the live feed first. Without `fetch` the entries are empty.
+    """
+    players: dict = tournament.get("players", {}) or {}
+    await _backfill_map_metadata(client, tournament)
+    # With the live feed connected, scores come from its snapshot; polling fills the gaps
+    if client.live_scores is not None:
+        client.live_scores.track(_tournament_key(tournament), tournament)
+    for map_id, map_config in _scored_maps(tournament.get("maps") or {}):
+        entries = await _fetch_map_scores(client, players, map_config) if fetch else []
+        for player_key, score_value, accuracy_value in entries:
+            matrix.set(player_key, map_id, score_value, accuracy_value)
+        yield map_id, map_config, entries
+
+
+def _empty_score_matrix(tournament: dict) -> ScoreMatrix:
+    return ScoreMatrix(list(tournament.get("players") or {}), list(tournament.get("maps") or {}))
+
+
+async def _collect_score_matrix(client: discord.Client, tournament: dict) -> ScoreMatrix:
+    """Scores for every player and map, without touching the score history."""
+    matrix = _empty_score_matrix(tournament)
+    async for _ in _iter_map_scores(client, tournament, matrix):
+        pass
+    return matrix
+
+
+async def _render_tournament_detail_embed(
+    client: discord.Client, tournament: dict, *, loading: bool = False
 ) -> discord.Embed:
     players: dict = tournament.get("players", {})
 
@@ -76,61 +303,25 @@ async def build_tournament_detail_embed(
     if end_raw is not None:
         embed.add_field(name="End", value=_discord_timestamp(end_raw, "F"), inline=False)
     
-    maps_config = tournament.get("maps") or {}
-    map_ids = list(maps_config.keys())
-    
-    data = await interaction.client.beatsaver.get_maps_by_ids(map_ids) if map_ids else {}
-    # Ensure map order matches the JSON (playlist) order
-    for map_id in map_ids:
-        map = data.get(map_id)
-        if not map:
-            continue
+    matrix = _empty_score_matrix(tournament)
 
-        map_name = f'{map.get("metadata", {}).get("songName", "Unknown")}'
-        map_config = (tournament.get("maps") or {}).get(map_id, {})
+    # Maps come in the JSON (playlist) order
+    async for map_id, map_config, history_entries in _iter_map_scores(
+        client, tournament, matrix, fetch=not loading
+    ):
+        map_name = map_config.get("songName") or map_config.get("name") or "Unknown"
         characteristic = map_config.get("characteristic", "Unknown")
         difficulty = map_config.get("difficulty", "Unknown")
 
         if loading:
             scores_text = "Loading..."
         else:
-            # Derive the max score for this map/difficulty from BeatSaver data
-            versions = map.get("versions") or []
-            max_score_for_map: int | None = None
-            target_hash = map_config.get("hash", "").upper()
-            for version in versions:
-                if str(version.get("hash", "")).upper() != target_hash:
-                    continue
-                for diff in version.get("diffs", []):
-                    if (
-                        diff.get("difficulty") == difficulty
-                        and diff.get("characteristic") == characteristic
-                    ):
-                        max_score_for_map = diff.get("maxScore")
-                        break
-                if max_score_for_map is not None:
-                    break
-
             score_entries: list[tuple[str, float | int | None, float | None]] = []
-            for player_data in players.values():
-                try:
-                    score_data = await interaction.client.beatleader.get_player_score_with_accuracy(player_data, map_config)
-                except Exception:
-                    score_data = None
-                if score_data is None:
-                    score_value = None
-                    accuracy_value = None
-                else:
-                    score_value = score_data.get("score")
-                    # If BeatLeader accuracy is not present, derive percentage from BeatSaver maxScore
-                    bl_accuracy = score_data.get("accuracy")
-                    if isinstance(bl_accuracy, (int, float)):
-                        accuracy_value = float(bl_accuracy)
-                    elif isinstance(score_value, (int, float)) and isinstance(max_score_for_map, (int, float)) and max_score_for_map > 0:
-                        accuracy_value = (score_value / max_score_for_map) * 100.0
-                    else:
-                        accuracy_value = None
-                score_entries.append((player_data["beatleaderUsername"], score_value, accuracy_value))
+            for player_key, score_value, accuracy_value in history_entries:
+                score_entries.append((players[player_key]["beatleaderUsername"], score_value, accuracy_value))
+
+            improved = client.score_history.record(_tournament_key(tournament), map_id, history_entries)
+            improved_names = {players[key]["beatleaderUsername"] for key in improved}
 
             score_entries.sort(key=lambda item: item[1] if item[1] is not None else float("-inf"), reverse=True)
             max_name = max((len(username) for username, _, _ in score_entries), default=0)
@@ -152,6 +343,7 @@ async def build_tournament_detail_embed(
                     f"{username.ljust(max_name)}  "
                     f"{(str(score) if score is not None else 'N/A').rjust(max_score)}  "
                     f"{(f'{accuracy:.2f}%' if accuracy is not None else 'N/A%').rjust(max_percent)}"
+                    f"{' ↑' if username in improved_names else ''}"
                     for username, score, accuracy in score_entries
                 )
                 if score_entries
@@ -162,97 +354,327 @@ async def build_tournament_detail_embed(
             name="",
             value=(
                 f"[{map_name} {characteristic} - {difficulty}]"
-                f"(https://beatsaver.com/maps/{map.get('id', '')})\n```{scores_text}```"
+                f"(https://beatsaver.com/maps/{map_config['key']})\n```{scores_text}```"
             ),
             inline=False,
         )
 
+    # Discord rejects embeds with more than 25 fields; the maps take priority over the summary
+    if not loading and players and matrix.maps and len(embed.fields) < PAGE_SIZE:
+        embed.add_field(
+            name="Overall standings",
+            value=f"```{_format_standings(tournament, matrix, players)}```",
+            inline=False,
+        )
+
     return embed
     
 
+def _leaderboard_version(tournament: dict) -> str:
+    """Hash of what a rendered leaderboard depends on besides scores."""
+    maps = tournament.get("maps") or {}
+    payload = [
+        tournament.get("name"),
+        tournament.get("startDate"),
+        tournament.get("endDate"),
+        tournament.get("standingsMethod"),
+        tournament.get("standingsBestN"),
+        [(map_id, (config or {}).get("hash"), (config or {}).get("difficulty")) for map_id, config in maps.items()],
+        [(key, (player or {}).get("beatleaderId")) for key, player in (tournament.get("players") or {}).items()],
+    ]
+    return hashlib.sha256(json.dumps(payload, default=str).encode("utf-8")).hexdigest()
+
+
+def _cache_leaderboard_render(client: discord.Client, tournament: dict) -> asyncio.Task:
+    """Render `tournament` into the leaderboard cache, sharing a render already in flight."""
+    return client.leaderboard_cache.revalidate(
+        _tournament_key(tournament),
+        _leaderboard_version(tournament),
+        lambda: _render_tournament_detail_embed(client, tournament),
+    )
+
+
+def _final_leaderboard(tournament: dict) -> discord.Embed | None:
+    """The standings snapshotted at the end boundary, once the tournament is over."""
+    snapshot = tournament.get("finalLeaderboard")
+    bounds = TournamentsFile._bounds(tournament)
+    if not snapshot or bounds is None or bounds[1] > datetime.now().timestamp():
+        return None
+    return discord.Embed.from_dict(snapshot)
+
+
+async def cached_leaderboard_embed(
+    client: discord.Client,
+    tournament: dict,
+    *,
+    on_update: Callable[[discord.Embed], Awaitable[None]] | None = None,
+) -> discord.Embed:
+    """
+    The tournament's leaderboard from the cache, labeled with its age. Only a
+    cold cache waits for a render. A stale entry is returned as is while a
+    background render refreshes it; `on_update` then receives the new embed.
+    Ended tournaments show their final snapshot, so later scores don't count.
+    """
+    final = _final_leaderboard(tournament)
+    if final is not None:
+        return final
+    cache = client.leaderboard_cache
+    key = _tournament_key(tournament)
+    version = _leaderboard_version(tournament)
+    entry = cache.lookup(key, version)
+    if entry is None:
+        entry = await asyncio.shield(_cache_leaderboard_render(client, tournament))
+        return _label_leaderboard(entry)
+    if cache.is_fresh(entry, version):
+        return _label_leaderboard(entry)
+
+    async def _notify(updated: CachedLeaderboard) -> None:
+        await on_update(_label_leaderboard(updated))
+
+    cache.revalidate(
+        key,
+        version,
+        lambda: _render_tournament_detail_embed(client, tournament),
+        _notify if on_update is not None else None,
+    )
+    return _label_leaderboard(entry, updating=True)
+
+
+def _update_original_response(
+    interaction: discord.Interaction, view: "TournamentDetailView"
+) -> Callable[[discord.Embed], Awaitable[None]]:
+    """on_update callback that swaps in the revalidated leaderboard while `view` still shows the tournament."""
+    name = view.tournament.get("name")
+
+    async def _update(embed: discord.Embed) -> None:
+        if view.tournament.get("name") == name and not view.is_finished():
+            await interaction.edit_original_response(embed=embed)
+
+    return _update
+
+
 class TournamentsFile:
-    FILE_PATH = "tournaments.json"
+    """
+    One guild's tournament store, split into a hot file of live and upcoming
+    tournaments and a cold archive of finished ones. Tournaments are moved to
+    the archive once their end date has passed; lookups by name fall back to
+    it. Get the store for a guild with `for_guild`; the files live in that
+    guild's GuildData partition. Every update re-reads the file and writes it
+    back without awaiting in between, so updates on the event loop never
+    interleave.
+    """
+
+    _stores: dict[int, "TournamentsFile"] = {}
+
+    def __init__(self, partition: GuildData) -> None:
+        self.guild_id = partition.guild_id
+        self.file_path = partition.path("tournaments.json")
+        self.archive_path = partition.path("tournaments_archive.json")
+        self._name_index: PrefixIndex | None = None
+        self._name_index_version: tuple | None = None
+        self._hot_version: tuple[int, int] | None = None
+        self._hot_records: dict[str, dict] = {}
+        self._hot_index = IntervalIndex()
+
+    @classmethod
+    def for_guild(cls, guild_id: int | None) -> "TournamentsFile":
+        partition = GuildData.get(guild_id)
+        store = cls._stores.get(partition.guild_id)
+        if store is None or store.file_path != partition.path("tournaments.json"):
+            store = cls(partition)
+            cls._stores[partition.guild_id] = store
+        return store
+
+    def _version(self, path: str | None = None) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(path or self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
 
-    @staticmethod
-    def _load() -> list[dict]:
+    def _load(self, path: str | None = None) -> list[dict]:
+        path = path or self.file_path
         try:
-            with open(TournamentsFile.FILE_PATH, "r", encoding="utf-8") as file:
+            with open(path, "rb") as file:
                 data = file.read().strip()
                 if not data:
                     return []
-                return json.loads(data)
-        except (FileNotFoundError, json.JSONDecodeError):
-            with open(TournamentsFile.FILE_PATH, "w", encoding="utf-8") as file:
+                tournaments = json_codec.loads(data)
+        except FileNotFoundError:
+            tournaments = None
+        except json.JSONDecodeError:
+            if path == self.archive_path:
+                # Finished tournaments exist nowhere else; keep the bad file for recovery
+                aside = f"{path}.corrupt-{int(datetime.now().timestamp())}"
+                os.replace(path, aside)
+                log.warning("Could not read %s; moved it to %s and started a new archive", path, aside)
+                return []
+            tournaments = None
+        if tournaments is None:
+            with open(path, "w", encoding="utf-8") as file:
                 json.dump([], file)
             return []
+        for tournament in tournaments:
+            tournament["guildId"] = self.guild_id
+        return tournaments
+
+    def _write(self, tournaments: list[dict], path: str | None = None) -> None:
+        # guildId is stamped on load from the partition, not stored
+        stored = [{key: value for key, value in tournament.items() if key != "guildId"} for tournament in tournaments]
+        with open(path or self.file_path, "wb") as file:
+            file.write(json_codec.dumps(stored, indent=True))
+        # mtime granularity can hide quick successive writes, so drop the caches outright
+        self._hot_version = None
+        self._name_index = None
 
     @staticmethod
-    def _write(tournaments: list[dict]) -> None:
-        with open(TournamentsFile.FILE_PATH, "w", encoding="utf-8") as file:
-            json.dump(tournaments, file, indent=4)
-    
-    @staticmethod
-    def get_tournaments(active: bool = True) -> list[dict]:
-        tournaments = TournamentsFile._load()
-        if not active:
-            return tournaments
-
+    def _bounds(tournament: dict) -> tuple[float, float] | None:
+        """(start, end) timestamps, or None when either date is missing or invalid; such tournaments are never archived."""
+        try:
+            return float(tournament["startDate"]), float(tournament["endDate"])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _hot(self, now: float) -> tuple[dict[str, dict], IntervalIndex]:
+        """Hot tournaments by name and their interval index, archiving any that have ended."""
+        version = self._version()
+        if version != self._hot_version:
+            records = {tournament.get("name", ""): tournament for tournament in self._load()}
+            intervals = []
+            for name, tournament in records.items():
+                bounds = self._bounds(tournament)
+                if bounds is not None:
+                    intervals.append((*bounds, name))
+            self._hot_records = records
+            self._hot_index = IntervalIndex(intervals)
+            self._hot_version = self._version()
+
+        ended = self._hot_index.ended(now)
+        if ended:
+            self._archive(set(ended))
+            return self._hot(now)
+        return self._hot_records, self._hot_index
+
+    def _archive(self, names: set[str]) -> None:
+        tournaments = self._load()
+        finished = [tournament for tournament in tournaments if tournament.get("name") in names]
+        archive = [
+            tournament
+            for tournament in self._load(self.archive_path)
+            if tournament.get("name") not in names
+        ]
+        # Write the archive first so a failure in between leaves a duplicate rather than a loss
+        self._write(archive + finished, self.archive_path)
+        self._write([tournament for tournament in tournaments if tournament.get("name") not in names])
+        log.info("Archived %d finished tournament(s): %s", len(finished), ", ".join(sorted(names)))
+
+    def get_tournaments(self, include_upcoming: bool = False) -> list[dict]:
+        """
+        Live tournaments, or with `include_upcoming` everything not yet archived:
+        live, upcoming and undated ones. Finished tournaments are in get_archived().
+        """
         now = datetime.now().timestamp()
-        active_tournaments: list[dict] = []
-        for tournament in tournaments:
-            try:
-                start = float(tournament.get("startDate", 0))
-                end = float(tournament.get("endDate", 0))
-            except (TypeError, ValueError):
-                continue
-            if start <= now <= end:
-                active_tournaments.append(tournament)
-        return active_tournaments
+        records, index = self._hot(now)
+        names = list(records) if include_upcoming else index.overlapping(now)
+        return [copy.deepcopy(records[name]) for name in names]
 
-    @staticmethod
-    def get_tournament(name: str) -> dict:
-        tournaments = TournamentsFile._load()
-        for tournament in tournaments:
+    def get_upcoming(self, limit: int | None = None) -> list[dict]:
+        now = datetime.now().timestamp()
+        records, index = self._hot(now)
+        return [copy.deepcopy(records[name]) for name in index.upcoming(now, limit)]
+
+    def get_archived(self) -> list[dict]:
+        return self._load(self.archive_path)
+
+    def search_names(self, prefix: str, limit: int = PAGE_SIZE) -> list[str]:
+        """Tournament names (including archived) matching `prefix`; the index is rebuilt only when a file changes."""
+        version = (self._version(), self._version(self.archive_path))
+        if self._name_index is None or version != self._name_index_version:
+            tournaments = self._load() + self.get_archived()
+            names = {tournament.get("name", "") for tournament in tournaments}
+            self._name_index = PrefixIndex((name, name) for name in names if name)
+            self._name_index_version = version
+        return [name for name, _ in self._name_index.search(prefix, limit)]
+
+    def get_tournament(self, name: str) -> dict:
+        records, _ = self._hot(datetime.now().timestamp())
+        if name in records:
+            return copy.deepcopy(records[name])
+        for tournament in self.get_archived():
             if tournament.get("name") == name:
                 return tournament
         raise ValueError(f"Tournament '{name}' not found.")
 
-    @staticmethod
     def save_tournament(
+        self,
         name: str,
         startDate: int | float | str | None = None,
         endDate: int | float | str | None = None,
         maps: dict | None = None,
         players: dict | None = None,
+        finalLeaderboard: dict | None = None,
+        standingsMethod: str | None = None,
+        standingsBestN: int | None = None,
     ) -> None:
-        tournaments = TournamentsFile._load()
+        def _update(existing: dict) -> dict:
+            updated = existing.copy()
+            if startDate is not None:
+                updated["startDate"] = startDate
+            if endDate is not None:
+                updated["endDate"] = endDate
+            if maps is not None:
+                updated["maps"] = maps
+            if players is not None:
+                updated["players"] = players
+            if finalLeaderboard is not None:
+                updated["finalLeaderboard"] = finalLeaderboard
+            if standingsMethod is not None:
+                updated["standingsMethod"] = standingsMethod
+            if standingsBestN is not None:
+                # 0 counts every map
+                if standingsBestN > 0:
+                    updated["standingsBestN"] = standingsBestN
+                else:
+                    updated.pop("standingsBestN", None)
+            return updated
+
+        tournaments = self._load()
         for index, existing in enumerate(tournaments):
             if existing.get("name") == name:
-                updated = existing.copy()
-                if startDate is not None:
-                    updated["startDate"] = startDate
-                if endDate is not None:
-                    updated["endDate"] = endDate
-                if maps is not None:
-                    updated["maps"] = maps
-                if players is not None:
-                    updated["players"] = players
-                tournaments[index] = updated
-                break
-        else:
-            if startDate is None or endDate is None:
-                raise ValueError("startDate and endDate are required for new tournaments.")
-            tournaments.append(
-                {
-                    "name": name,
-                    "startDate": startDate,
-                    "endDate": endDate,
-                    "maps": maps or {},
-                    "players": players or {},
-                }
-            )
-        TournamentsFile._write(tournaments)
-    
+                tournaments[index] = _update(existing)
+                self._write(tournaments)
+                return
+
+        archive = self.get_archived()
+        for index, existing in enumerate(archive):
+            if existing.get("name") == name:
+                updated = _update(existing)
+                bounds = self._bounds(updated)
+                if bounds is not None and bounds[1] < datetime.now().timestamp():
+                    archive[index] = updated
+                    self._write(archive, self.archive_path)
+                    return
+                # The end date moved into the future: bring it back to the hot file
+                tournaments.append(updated)
+                self._write(tournaments)
+                del archive[index]
+                self._write(archive, self.archive_path)
+                return
+
+        # New tournaments may be undated (created from a playlist); they stay hot until dated
+        tournaments.append(_update({"name": name, "maps": {}, "players": {}}))
+        self._write(tournaments)
+
+    def update_players(self, name: str, add: dict | None = None, remove: Iterable[str] = ()) -> dict:
+        """Apply player changes to the stored tournament rather than a possibly stale copy; returns it."""
+        players = dict(self.get_tournament(name).get("players") or {})
+        players.update(add or {})
+        for key in remove:
+            players.pop(key, None)
+        self.save_tournament(name=name, players=players)
+        return self.get_tournament(name)
+
+
 class ConfirmationModal(discord.ui.Modal, title='Confirmation'):
     def __init__(self, message: str, action) -> None:
         super().__init__()
@@ -271,7 +693,7 @@ class ConfirmationModal(discord.ui.Modal, title='Confirmation'):
             await interaction.response.send_message("Action cancelled. Confirmation text did not match.", ephemeral=True)
 
 class TournamentCreateModal(discord.ui.Modal, title='Create Tournament'):
-    def __init__(self, name=None, startTime=None, endTime=None) -> None:
+    def __init__(self, name=None, startTime=None, endTime=None, standingsMethod=None, standingsBestN=None) -> None:
         super().__init__()
         central_now = datetime.now(ZoneInfo("America/Chicago")).strftime("%Y-%m-%d %H:%M")
         self.name = discord.ui.TextInput(
@@ -292,9 +714,24 @@ class TournamentCreateModal(discord.ui.Modal, title='Create Tournament'):
             max_length=50,
             default=endTime or central_now,
         )
+        self.standingsMethod = discord.ui.TextInput(
+            label=f"Standings ({', '.join(METHODS)})",
+            placeholder='How overall standings are ranked',
+            max_length=20,
+            default=standingsMethod or 'total',
+        )
+        self.standingsBestN = discord.ui.TextInput(
+            label='Best N maps counted (blank for all)',
+            placeholder='Only count each player\'s N best maps',
+            required=False,
+            max_length=4,
+            default=str(standingsBestN) if standingsBestN else '',
+        )
         self.add_item(self.name)
         self.add_item(self.startTime)
         self.add_item(self.endTime)
+        self.add_item(self.standingsMethod)
+        self.add_item(self.standingsBestN)
     
     async def on_submit(self, interaction: discord.Interaction):
         try:
@@ -304,24 +741,101 @@ class TournamentCreateModal(discord.ui.Modal, title='Create Tournament'):
             await interaction.response.send_message("Invalid date format. Please use YYYY-MM-DD HH:MM.", ephemeral=True)
             return
 
-        TournamentsFile.save_tournament(
+        method = self.standingsMethod.value.strip().lower()
+        if method not in METHODS:
+            await interaction.response.send_message(
+                f"Invalid standings method. Use one of: {', '.join(METHODS)}.", ephemeral=True
+            )
+            return
+        best_n_text = self.standingsBestN.value.strip()
+        if best_n_text and (not best_n_text.isdigit() or int(best_n_text) <= 0):
+            await interaction.response.send_message("Best N maps must be a positive whole number.", ephemeral=True)
+            return
+
+        TournamentsFile.for_guild(interaction.guild_id).save_tournament(
             name=self.name.value,
             startDate=start_timestamp,
             endDate=end_timestamp,
+            standingsMethod=method,
+            standingsBestN=int(best_n_text) if best_n_text else 0,
+        )
+        interaction.client.lifecycle.schedule(
+            _tournament_key({"guildId": interaction.guild_id, "name": self.name.value}),
+            start_timestamp,
+            end_timestamp,
         )
         await interaction.response.send_message(f"Changes saved successfully", ephemeral=True)
 
 class TournamentEditModal(TournamentCreateModal, title='Edit Tournament'):
-    def __init__(self, name, startTime, endTime) -> None:
-        super().__init__(name, startTime, endTime)
+    def __init__(self, name, startTime, endTime, standingsMethod=None, standingsBestN=None) -> None:
+        super().__init__(name, startTime, endTime, standingsMethod, standingsBestN)
 
 
 class TournamentView(discord.ui.View):
-    def __init__(self, *, timeout: float | None = None, interaction: discord.Interaction) -> None:
+    def __init__(
+        self,
+        *,
+        timeout: float | None = None,
+        interaction: discord.Interaction,
+        tournaments: list[dict] | None = None,
+        page: int = 0,
+        archived: bool = False,
+    ) -> None:
         super().__init__(timeout=timeout)
         self.interaction = interaction
-        if TournamentsFile.get_tournaments(active=False):
-            self.add_item(TournamentPicker(TournamentsFile.get_tournaments(active=False), interaction))
+        self.archived = archived
+        if tournaments is None:
+            tournaments = TournamentsFile.for_guild(interaction.guild_id).get_tournaments(include_upcoming=True)
+        self.tournaments = tournaments
+        self.page = min(max(page, 0), _page_count(len(self.tournaments)) - 1)
+        if self.tournaments:
+            page_tournaments = self.tournaments[self.page * PAGE_SIZE:(self.page + 1) * PAGE_SIZE]
+            self.add_item(TournamentPicker(page_tournaments, interaction))
+
+        if _page_count(len(self.tournaments)) > 1:
+            self.previous_page.disabled = self.page == 0
+            self.next_page.disabled = self.page >= _page_count(len(self.tournaments)) - 1
+        else:
+            self.remove_item(self.previous_page)
+            self.remove_item(self.next_page)
+
+    async def _show_page(self, interaction: discord.Interaction, page: int) -> None:
+        view = TournamentView(
+            interaction=self.interaction, tournaments=self.tournaments, page=page, archived=self.archived
+        )
+        embed = await build_tournaments_embed(interaction, self.tournaments, view.page, self.archived)
+        await interaction.response.edit_message(embed=embed, view=view)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.gray, row=1)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show_page(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.gray, row=1)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show_page(interaction, self.page + 1)
+
+def _tournament_key(tournament: dict) -> str:
+    """Identifies a tournament across guilds, e.g. in the score history and lifecycle scheduler."""
+    return f"{tournament.get('guildId')}/{tournament.get('name', '')}"
+
+
+def _registration_open(tournament: dict) -> bool:
+    """Players can join until the tournament ends; admins can still register them afterwards."""
+    try:
+        return datetime.now().timestamp() <= float(tournament.get("endDate"))
+    except (TypeError, ValueError):
+        return True
+
+
+def _has_admin_role(interaction: discord.Interaction) -> bool:
+    """Tournament admins are members with Manage Server or one of the guild's configured admin roles."""
+    if not isinstance(interaction.user, discord.Member) or interaction.guild_id is None:
+        return False
+    if interaction.user.guild_permissions.manage_guild:
+        return True
+    admin_role_ids = GuildData.get(interaction.guild_id).admin_role_ids
+    return any(role.id in admin_role_ids for role in interaction.user.roles)
+
 
 class TournamentPicker(discord.ui.Select):
     def __init__(self, tournaments: list[dict], interaction: discord.Interaction = None) -> None:
@@ -349,20 +863,15 @@ class TournamentPicker(discord.ui.Select):
 
     async def callback(self, interaction: discord.Interaction) -> None:
         selected_tournament_name = self.values[0]
-        tournament = TournamentsFile.get_tournament(selected_tournament_name)
-        embed = await build_tournament_detail_embed(interaction, tournament)
-        admin_role_id = 849470981751177267
-        has_admin_role = (
-            isinstance(interaction.user, discord.Member)
-            and any(role.id == admin_role_id for role in interaction.user.roles)
-        )
-
+        tournament = TournamentsFile.for_guild(interaction.guild_id).get_tournament(selected_tournament_name)
         await interaction.response.defer()
-        if has_admin_role:
+        if _has_admin_role(interaction):
             view = TournamentAdminDetailView(tournament, interaction)
-            await self.interaction.edit_original_response(embed=embed, view=view)
-            return
-        view = TournamentDetailView(tournament, interaction)
+        else:
+            view = TournamentDetailView(tournament, interaction)
+        embed = await cached_leaderboard_embed(
+            interaction.client, tournament, on_update=_update_original_response(self.interaction, view)
+        )
         await self.interaction.edit_original_response(embed=embed, view=view)
 
 class TournamentDetailView(discord.ui.View):
@@ -374,36 +883,39 @@ class TournamentDetailView(discord.ui.View):
         
     @discord.ui.button(label="Join", style=discord.ButtonStyle.green)
     async def join_tournament(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        if not _registration_open(self.tournament):
+            await interaction.response.send_message("Registration for this tournament has closed.", ephemeral=True)
+            return
         discord_id = str(interaction.user.id)
-        player = await interaction.client.beatleader.get_player_by_discord_id(discord_id)
+        player = await interaction.client.identities.get_by_discord_id(discord_id)
         if not player:
             # If Discord is not linked, ask for BeatLeader username or let the user choose to link instead.
             modal = JoinWithUsernameModal(self)
             await interaction.response.send_modal(modal)
             return
         
-        updated_players = self.tournament.get("players", {})
-        updated_players[discord_id] = {
-            "beatleaderUsername": player["name"],
-            "beatleaderId": player["id"]
-        }
-        
-        TournamentsFile.save_tournament(
-            name=self.tournament.get("name", ""),
-            players=updated_players
+        updated_tournament = TournamentsFile.for_guild(interaction.guild_id).update_players(
+            self.tournament.get("name", ""),
+            add={
+                discord_id: {
+                    "beatleaderUsername": player["name"],
+                    "beatleaderId": player["id"],
+                    "discordId": discord_id,
+                }
+            },
         )
-
-        updated_tournament = TournamentsFile.get_tournament(self.tournament.get("name", ""))
-        embed = await build_tournament_detail_embed(interaction, updated_tournament)
+        await interaction.response.defer()
         self.tournament = updated_tournament
         self.update_buttons()
-        await interaction.response.defer()
+        embed = await cached_leaderboard_embed(
+            interaction.client, updated_tournament, on_update=_update_original_response(self.interaction, self)
+        )
         await self.interaction.edit_original_response(content=f"You have joined the tournament '{self.tournament.get('name', '')}'.", embed=embed, view=self)
 
     def update_buttons(self) -> None:
         discord_id = str(self.interaction.user.id)
         is_registered = discord_id in self.tournament.get("players", {})
-        self.join_tournament.disabled = is_registered
+        self.join_tournament.disabled = is_registered or not _registration_open(self.tournament)
 
 class TournamentAdminDetailView(TournamentDetailView):
     def __init__(self, tournament: dict, interaction: discord.Interaction) -> None:
@@ -419,10 +931,13 @@ class TournamentAdminDetailView(TournamentDetailView):
 
         start_time = _format_ts(self.tournament.get("startDate"))
         end_time = _format_ts(self.tournament.get("endDate"))
+        method, best_n = standings_options(self.tournament)
         modal = TournamentEditModal(
             name=self.tournament.get("name", ""),
             startTime=start_time,
             endTime=end_time,
+            standingsMethod=method,
+            standingsBestN=best_n,
         )
         await interaction.response.send_modal(modal)
     
@@ -452,20 +967,83 @@ class TournamentAdminDetailView(TournamentDetailView):
             )
             return
         await interaction.response.defer(ephemeral=True)
-        tournament = TournamentsFile.get_tournament(self.tournament.get("name", ""))
-        embed = await build_tournament_detail_embed(interaction, tournament)
-        _set_leaderboard_refresh_footer(embed)
+        tournament = TournamentsFile.for_guild(interaction.guild_id).get_tournament(self.tournament.get("name", ""))
+        partition = GuildData.get(interaction.guild_id)
+        posted: list[discord.Message] = []
+
+        async def _show_update(updated: discord.Embed) -> None:
+            if posted:
+                await interaction.client.edit_scheduler.edit(posted[0], embed=updated)
+                partition.update_fingerprint(posted[0].id, _embed_fingerprint(updated))
+
+        embed = await cached_leaderboard_embed(interaction.client, tournament, on_update=_show_update)
         view = LeaderboardPublicView(tournament_name=tournament.get("name", ""))
         try:
-            await interaction.channel.send(embed=embed, view=view)
+            message = await interaction.channel.send(embed=embed, view=view)
         except discord.Forbidden:
             await interaction.followup.send(
                 "Missing permissions to post here. The bot needs **Embed Links** (and **Send Messages**) in this channel. Ask a server admin to enable them.",
                 ephemeral=True,
             )
             return
+        posted.append(message)
+        partition.register_leaderboard(
+            message.id, message.channel.id, tournament.get("name", ""), _embed_fingerprint(embed)
+        )
         await interaction.followup.send("Leaderboard posted to the channel.", ephemeral=True)
 
+    @discord.ui.button(label="Export results", style=discord.ButtonStyle.secondary)
+    async def export_results(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await interaction.response.send_message(
+            "Export the full results table as:", view=ExportResultsView(self.tournament.get("name", "")), ephemeral=True
+        )
+
+
+class ExportResultsView(discord.ui.View):
+    """Format picker for the admin results export."""
+
+    def __init__(self, tournament_name: str) -> None:
+        super().__init__(timeout=180)
+        self.tournament_name = tournament_name
+
+    async def _send_export(self, interaction: discord.Interaction, fmt: str) -> None:
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            tournament = TournamentsFile.for_guild(interaction.guild_id).get_tournament(self.tournament_name)
+        except ValueError as exc:
+            await interaction.followup.send(str(exc), ephemeral=True)
+            return
+        try:
+            matrix = await _collect_score_matrix(interaction.client, tournament)
+            file = export_results(tournament, matrix, fmt)
+        except Exception:
+            log.exception("Exporting results for %s failed", self.tournament_name)
+            await interaction.followup.send("Could not export the results. Please try again later.", ephemeral=True)
+            return
+        try:
+            filename = f"{_export_filename(self.tournament_name)}.{fmt}"
+            await interaction.followup.send(
+                f"Results for **{self.tournament_name}** "
+                f"({len(matrix.players)} players × {len(matrix.maps)} maps).",
+                file=discord.File(file, filename=filename),
+                ephemeral=True,
+            )
+        finally:
+            file.close()
+
+    @discord.ui.button(label="CSV", style=discord.ButtonStyle.primary)
+    async def export_csv(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._send_export(interaction, "csv")
+
+    @discord.ui.button(label="JSON", style=discord.ButtonStyle.secondary)
+    async def export_json(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._send_export(interaction, "json")
+
+
+def _export_filename(name: str) -> str:
+    slug = "".join(char if char.isalnum() or char in "-_" else "_" for char in name).strip("_")
+    return slug or "tournament"
+
 
 class LeaderboardPublicView(discord.ui.View):
     """View for the public leaderboard message: refresh button, never times out."""
@@ -476,10 +1054,14 @@ class LeaderboardPublicView(discord.ui.View):
 
     @discord.ui.button(label="Refresh", style=discord.ButtonStyle.secondary, custom_id="leaderboard_public_refresh")
     async def refresh_scores(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
-        # Get tournament name from this view or from the message embed (for persistent view after restart)
-        name = self.tournament_name
-        if not name and interaction.message.embeds:
-            name = interaction.message.embeds[0].title or ""
+        message = interaction.message
+        partition = GuildData.get(interaction.guild_id)
+        registered = partition.get_leaderboard(message.id)
+        # Get tournament name from this view, the guild's leaderboard registry, or the
+        # message embed (leaderboards posted before the registry existed)
+        name = self.tournament_name or (registered or {}).get("tournament", "")
+        if not name and message.embeds:
+            name = message.embeds[0].title or ""
         if not name:
             await interaction.response.send_message(
                 "Could not determine which tournament to refresh.",
@@ -487,7 +1069,7 @@ class LeaderboardPublicView(discord.ui.View):
             )
             return
         try:
-            tournament = TournamentsFile.get_tournament(name)
+            tournament = TournamentsFile.for_guild(interaction.guild_id).get_tournament(name)
         except ValueError:
             await interaction.response.send_message(
                 "This tournament no longer exists or was renamed.",
@@ -495,33 +1077,135 @@ class LeaderboardPublicView(discord.ui.View):
             )
             return
         await interaction.response.defer()
-        # Show loading state immediately (BeatSaver only, no BeatLeader calls)
-        loading_embed = await build_tournament_detail_embed(interaction, tournament, loading=True)
-        _set_leaderboard_refresh_footer(loading_embed)
         view = LeaderboardPublicView(tournament_name=tournament.get("name", ""))
-        await interaction.message.edit(embed=loading_embed, view=view)
-        # Fetch real scores then update
-        embed = await build_tournament_detail_embed(interaction, tournament)
-        _set_leaderboard_refresh_footer(embed)
-        await interaction.message.edit(embed=embed, view=view)
+        showed_stale = False
+
+        async def _show_update(updated: discord.Embed) -> None:
+            fingerprint = _embed_fingerprint(updated)
+            entry = partition.get_leaderboard(message.id) or {}
+            # Edit even when the scores are unchanged if the message still says "updating"
+            if fingerprint != entry.get("fingerprint") or showed_stale:
+                await interaction.client.edit_scheduler.edit(message, embed=updated, view=view)
+                partition.update_fingerprint(message.id, fingerprint)
+
+        # A cached leaderboard returns at once; only a cold cache takes long enough for the loading state
+        render = asyncio.create_task(
+            cached_leaderboard_embed(interaction.client, tournament, on_update=_show_update)
+        )
+        # Only show the loading state when the refresh is slow enough for it to be seen
+        showed_loading = False
+        try:
+            embed = await asyncio.wait_for(asyncio.shield(render), timeout=LEADERBOARD_LOADING_THRESHOLD)
+        except asyncio.TimeoutError:
+            loading_embed = await build_tournament_detail_embed(interaction, tournament, loading=True)
+            _set_leaderboard_refresh_footer(loading_embed)
+            # Queued rather than awaited: if it is still pending when the render finishes,
+            # the final embed replaces it and only one edit is sent
+            loading = interaction.client.edit_scheduler.submit(message, embed=loading_embed, view=view)
+            # Failures are logged by the scheduler; the final edit below retries anyway
+            loading.add_done_callback(lambda future: future.cancelled() or future.exception())
+            showed_loading = True
+            embed = await render
+
+        fingerprint = _embed_fingerprint(embed)
+        previous = (registered or {}).get("fingerprint")
+        if previous is None and message.embeds:
+            previous = _embed_fingerprint(message.embeds[0])
+        if showed_loading or fingerprint != previous:
+            showed_stale = (embed.footer.text or "").endswith("updating")
+            await interaction.client.edit_scheduler.edit(message, embed=embed, view=view)
+        if registered is None:
+            partition.register_leaderboard(message.id, message.channel.id, tournament.get("name", ""), fingerprint)
+        else:
+            partition.update_fingerprint(message.id, fingerprint)
 
 
 class RemovePlayerView(discord.ui.View):
-    def __init__(self, tournament: dict, parent_interaction: discord.Interaction) -> None:
+    def __init__(
+        self,
+        tournament: dict,
+        parent_interaction: discord.Interaction,
+        *,
+        page: int = 0,
+        query: str = "",
+    ) -> None:
         super().__init__(timeout=None)
         self.tournament = tournament
         self.parent_interaction = parent_interaction
+        self.query = query
 
         players: dict = tournament.get("players", {}) or {}
-        if players:
+        if query:
+            index = PrefixIndex(
+                (str(data.get("beatleaderUsername", "Unknown")), str(key)) for key, data in players.items()
+            )
+            keys = [key for _, key in index.search(query, limit=len(players))]
+        else:
+            keys = list(players)
+
+        self.match_count = len(keys)
+        pages = _page_count(len(keys))
+        self.page = min(max(page, 0), pages - 1)
+        page_keys = keys[self.page * PAGE_SIZE:(self.page + 1) * PAGE_SIZE]
+        if page_keys:
             self.add_item(
                 RemovePlayerSelect(
-                    players=players,
+                    players={key: players[key] for key in page_keys},
                     tournament_name=tournament.get("name", ""),
                     parent_interaction=parent_interaction,
                 )
             )
 
+        if pages > 1:
+            self.previous_page.disabled = self.page == 0
+            self.next_page.disabled = self.page >= pages - 1
+        else:
+            self.remove_item(self.previous_page)
+            self.remove_item(self.next_page)
+        if len(players) <= PAGE_SIZE and not query:
+            self.remove_item(self.find_player)
+
+    def describe(self) -> str:
+        """Message content to show alongside the view."""
+        if not self.query:
+            return "Select player(s) to remove:"
+        if not self.match_count:
+            return f"No players match '{self.query}'."
+        return f"{self.match_count} player(s) match '{self.query}':"
+
+    async def _show(self, interaction: discord.Interaction, *, page: int, query: str) -> None:
+        view = RemovePlayerView(self.tournament, self.parent_interaction, page=page, query=query)
+        await interaction.response.edit_message(content=view.describe(), view=view)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.gray, row=1)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, page=self.page - 1, query=self.query)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.gray, row=1)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await self._show(interaction, page=self.page + 1, query=self.query)
+
+    @discord.ui.button(label="Find player", style=discord.ButtonStyle.blurple, row=1)
+    async def find_player(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
+        await interaction.response.send_modal(PlayerSearchModal(self))
+
+
+class PlayerSearchModal(discord.ui.Modal, title='Find Player'):
+    def __init__(self, parent_view: RemovePlayerView) -> None:
+        super().__init__()
+        self.parent_view = parent_view
+        self.query_input = discord.ui.TextInput(
+            label="Username starts with",
+            placeholder="Leave blank to list every player",
+            required=False,
+            max_length=100,
+            default=parent_view.query,
+        )
+        self.add_item(self.query_input)
+
+    async def on_submit(self, interaction: discord.Interaction) -> None:
+        await self.parent_view._show(interaction, page=0, query=self.query_input.value.strip())
+
 
 class RemovePlayerSelect(discord.ui.Select):
     def __init__(
@@ -554,8 +1238,9 @@ class RemovePlayerSelect(discord.ui.Select):
         )
 
     async def callback(self, interaction: discord.Interaction) -> None:
+        store = TournamentsFile.for_guild(interaction.guild_id)
         try:
-            tournament = TournamentsFile.get_tournament(self.tournament_name)
+            tournament = store.get_tournament(self.tournament_name)
         except ValueError:
             await interaction.response.send_message(
                 "Tournament could not be found. It may have been removed or renamed.",
@@ -584,16 +1269,22 @@ class RemovePlayerSelect(discord.ui.Select):
             )
             return
 
-        TournamentsFile.save_tournament(
+        store.save_tournament(
             name=self.tournament_name,
             players=players,
         )
 
-        updated_tournament = TournamentsFile.get_tournament(self.tournament_name)
-        embed = await build_tournament_detail_embed(interaction, updated_tournament)
+        # Acknowledge before reading the leaderboard; a cold cache renders for longer than the token lasts
+        await interaction.response.defer()
+        updated_tournament = store.get_tournament(self.tournament_name)
         admin_view = TournamentAdminDetailView(updated_tournament, self.parent_interaction)
+        embed = await cached_leaderboard_embed(
+            interaction.client,
+            updated_tournament,
+            on_update=_update_original_response(self.parent_interaction, admin_view),
+        )
 
-        await interaction.response.edit_message(
+        await interaction.edit_original_response(
             content=(
                 f"Removed {', '.join(removed_usernames)} from "
                 f"'{updated_tournament.get('name', '')}'."
@@ -615,6 +1306,9 @@ class JoinWithUsernameModal(discord.ui.Modal, title='Join Tournament'):
         self.add_item(self.username_input)
 
     async def on_submit(self, interaction: discord.Interaction) -> None:
+        if not _registration_open(self.parent_view.tournament):
+            await interaction.response.send_message("Registration for this tournament has closed.", ephemeral=True)
+            return
         discord_id = str(interaction.user.id)
         username = self.username_input.value.strip()
 
@@ -627,7 +1321,7 @@ class JoinWithUsernameModal(discord.ui.Modal, title='Join Tournament'):
             )
             return
 
-        player = await interaction.client.beatleader.get_single_player_by_name(username)
+        player = await interaction.client.identities.get_by_name(username)
         if not player:
             await interaction.response.send_message(
                 f"No BeatLeader player found for username '{username}'.",
@@ -643,29 +1337,58 @@ class JoinWithUsernameModal(discord.ui.Modal, title='Join Tournament'):
             )
             return
 
-        updated_players[discord_id] = {
-            "beatleaderUsername": player.get("name", "Unknown"),
-            "beatleaderId": player.get("id"),
-        }
-
-        TournamentsFile.save_tournament(
-            name=self.parent_view.tournament.get("name", ""),
-            players=updated_players,
+        updated_tournament = TournamentsFile.for_guild(interaction.guild_id).update_players(
+            self.parent_view.tournament.get("name", ""),
+            add={
+                discord_id: {
+                    "beatleaderUsername": player.get("name", "Unknown"),
+                    "beatleaderId": player.get("id"),
+                    "discordId": discord_id,
+                }
+            },
         )
-
-        updated_tournament = TournamentsFile.get_tournament(self.parent_view.tournament.get("name", ""))
+        await interaction.response.defer()
         self.parent_view.tournament = updated_tournament
         self.parent_view.update_buttons()
-        embed = await build_tournament_detail_embed(interaction, updated_tournament)
+        embed = await cached_leaderboard_embed(
+            interaction.client,
+            updated_tournament,
+            on_update=_update_original_response(self.parent_view.interaction, self.parent_view),
+        )
 
-        await interaction.response.defer()
         await self.parent_view.interaction.edit_original_response(
             content=f"You have joined the tournament '{self.parent_view.tournament.get('name', '')}' as {player.get('name', 'Unknown')}.",
             embed=embed,
             view=self.parent_view,
         )
 
+def _parse_discord_id(line: str) -> str | None:
+    if line.startswith("<@") and line.endswith(">"):
+        inner = line[2:-1]
+        if inner.startswith("!"):
+            inner = inner[1:]
+        if inner.isdigit():
+            return inner
+    elif line.isdigit():
+        return line
+    return None
+
+
+def _join_within_limit(header: str, items: list[str], limit: int = 2000) -> str:
+    """Join `- item` lines under a header, cutting off with a count once `limit` characters is reached."""
+    text = header
+    for index, item in enumerate(items):
+        line = f"\n- {item}"
+        remaining = len(items) - index
+        if len(text) + len(line) + len(f"\n...and {remaining} more") > limit:
+            return text + f"\n...and {remaining} more"
+        text += line
+    return text
+
+
 class RegisterPlayerModal(discord.ui.Modal, title='Register Player'):
+    RESOLVE_CONCURRENCY = 8
+
     def __init__(self, parent_view: TournamentDetailView) -> None:
         super().__init__()
         self.parent_view = parent_view
@@ -673,11 +1396,40 @@ class RegisterPlayerModal(discord.ui.Modal, title='Register Player'):
             label="Discord ID / Mention / BeatLeader Username(s)",
             placeholder="One per line: Discord mention, Discord ID, or BeatLeader username",
             style=discord.TextStyle.paragraph,
-            max_length=1024,
+            max_length=4000,
         )
         self.add_item(self.discord_id_input)
 
+    async def _resolve(self, client: discord.Client, line: str) -> tuple[str | None, dict | None, str | None]:
+        """(player key, BeatLeader player, Discord id when the player was found through it)."""
+        discord_id = _parse_discord_id(line)
+        if discord_id is not None:
+            player = await client.identities.get_by_discord_id(discord_id)
+            if player:
+                return discord_id, player, discord_id
+
+        # Fallback to BeatLeader username search when Discord lookup fails or is not applicable
+        player = await client.identities.get_by_name(line)
+        if not player:
+            return None, None, None
+        return str(player.get("id")), player, None
+
+    async def _resolve_all(self, client: discord.Client, lines: list[str]) -> dict[str, tuple | BaseException]:
+        semaphore = asyncio.Semaphore(self.RESOLVE_CONCURRENCY)
+
+        async def _limited(line: str) -> tuple[str | None, dict | None, str | None]:
+            async with semaphore:
+                return await self._resolve(client, line)
+
+        unique_lines = list(dict.fromkeys(lines))
+        results = await asyncio.gather(
+            *(_limited(line) for line in unique_lines), return_exceptions=True
+        )
+        return dict(zip(unique_lines, results))
+
     async def on_submit(self, interaction: discord.Interaction) -> None:
+        await interaction.response.defer()
+
         lines = [
             line.strip()
             for line in self.discord_id_input.value.splitlines()
@@ -685,42 +1437,25 @@ class RegisterPlayerModal(discord.ui.Modal, title='Register Player'):
         ]
 
         if not lines:
-            await interaction.response.send_message("No players specified.", ephemeral=True)
+            await interaction.followup.send("No players specified.", ephemeral=True)
             return
 
+        resolved = await self._resolve_all(interaction.client, lines)
+
         existing_players: dict = self.parent_view.tournament.get("players", {}).copy()
         new_players: dict[str, dict] = {}
         errors: list[str] = []
 
         for index, raw in enumerate(lines, start=1):
-            line = raw
-            discord_id: str | None = None
-
-            if line.startswith("<@") and line.endswith(">"):
-                inner = line[2:-1]
-                if inner.startswith("!"):
-                    inner = inner[1:]
-                if inner.isdigit():
-                    discord_id = inner
-            elif line.isdigit():
-                discord_id = line
-
-            player = None
-            player_key: str | None = None
-
-            if discord_id is not None:
-                player = await interaction.client.beatleader.get_player_by_discord_id(discord_id)
-                if player:
-                    player_key = discord_id
+            result = resolved[raw]
+            if isinstance(result, BaseException):
+                errors.append(f"Line {index} ('{raw}'): lookup failed.")
+                continue
 
-            # Fallback to BeatLeader username search when Discord lookup fails or is not applicable
+            player_key, player, discord_id = result
             if player is None:
-                player = await interaction.client.beatleader.get_single_player_by_name(line)
-                if not player:
-                    errors.append(f"Line {index} ('{raw}'): no BeatLeader player found.")
-                    continue
-
-                player_key = str(player.get("id"))
+                errors.append(f"Line {index} ('{raw}'): no BeatLeader player found.")
+                continue
 
             if player_key is None:
                 errors.append(f"Line {index} ('{raw}'): could not resolve player.")
@@ -734,33 +1469,32 @@ class RegisterPlayerModal(discord.ui.Modal, title='Register Player'):
                 "beatleaderUsername": player.get("name", "Unknown"),
                 "beatleaderId": player.get("id"),
             }
+            if discord_id is not None:
+                new_players[player_key]["discordId"] = discord_id
 
         if not new_players:
-            if errors:
-                message = "No valid players to register.\n" + "\n".join(f"- {e}" for e in errors)
-            else:
-                message = "No valid players to register."
-            await interaction.response.send_message(message, ephemeral=True)
+            await interaction.followup.send(
+                _join_within_limit("No valid players to register.", errors), ephemeral=True
+            )
             return
 
-        updated_players = existing_players.copy()
-        updated_players.update(new_players)
-
-        TournamentsFile.save_tournament(
-            name=self.parent_view.tournament.get("name", ""),
-            players=updated_players,
+        self.parent_view.tournament = TournamentsFile.for_guild(interaction.guild_id).update_players(
+            self.parent_view.tournament.get("name", ""), add=new_players
         )
-
-        self.parent_view.tournament = TournamentsFile.get_tournament(self.parent_view.tournament.get("name", ""))
         self.parent_view.update_buttons()
-        embed = await build_tournament_detail_embed(interaction, self.parent_view.tournament)
+        embed = await cached_leaderboard_embed(
+            interaction.client,
+            self.parent_view.tournament,
+            on_update=_update_original_response(self.parent_view.interaction, self.parent_view),
+        )
 
         success_names = ", ".join(str(data.get("beatleaderUsername", "Unknown")) for data in new_players.values())
+        if len(success_names) > 900:
+            success_names = f"{success_names[:900]}... ({len(new_players)} players)"
         content = f"Registered {success_names} for '{self.parent_view.tournament.get('name', '')}'."
         if errors:
-            content += "\n\nSome entries could not be registered:\n" + "\n".join(f"- {e}" for e in errors)
+            content = _join_within_limit(content + "\n\nSome entries could not be registered:", errors)
 
-        await interaction.response.defer()
         await self.parent_view.interaction.edit_original_response(
             content=content,
             embed=embed,
@@ -769,13 +1503,212 @@ class RegisterPlayerModal(discord.ui.Modal, title='Register Player'):
 
 description = "View and edit tournaments."
 @app_commands.command(name="tournaments", description=description)
-async def tournaments(interaction: discord.Interaction) -> None:
-    tournament_ = TournamentsFile.get_tournaments(active=False)
-    embed = await build_tournaments_embed(interaction, tournament_)
-    view = TournamentView(interaction=interaction)
+@app_commands.guild_only()
+@app_commands.describe(
+    name="Open a tournament directly",
+    archived="List finished tournaments instead of live and upcoming ones",
+)
+async def tournaments(interaction: discord.Interaction, name: str | None = None, archived: bool = False) -> None:
+    store = TournamentsFile.for_guild(interaction.guild_id)
+    if name:
+        try:
+            tournament = store.get_tournament(name)
+        except ValueError:
+            await interaction.response.send_message(f"Tournament '{name}' not found.", ephemeral=True)
+            return
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        if _has_admin_role(interaction):
+            view = TournamentAdminDetailView(tournament, interaction)
+        else:
+            view = TournamentDetailView(tournament, interaction)
+        embed = await cached_leaderboard_embed(
+            interaction.client, tournament, on_update=_update_original_response(interaction, view)
+        )
+        await interaction.edit_original_response(embed=embed, view=view)
+        return
+
+    if archived:
+        tournament_ = store.get_archived()
+    else:
+        tournament_ = store.get_tournaments(include_upcoming=True)
+    embed = await build_tournaments_embed(interaction, tournament_, archived=archived)
+    view = TournamentView(interaction=interaction, tournaments=tournament_, archived=archived)
     await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
+
+@tournaments.autocomplete("name")
+async def tournament_name_autocomplete(
+    interaction: discord.Interaction, current: str
+) -> list[app_commands.Choice[str]]:
+    return [
+        app_commands.Choice(name=name[:100], value=name[:100])
+        for name in TournamentsFile.for_guild(interaction.guild_id).search_names(current)
+    ]
+
+
+settings_description = "Configure tournament admin roles and the announcement channel for this server."
+@app_commands.command(name="tournament_settings", description=settings_description)
+@app_commands.guild_only()
+@app_commands.default_permissions(manage_guild=True)
+@app_commands.describe(
+    add_admin_role="Members with this role can manage tournaments",
+    remove_admin_role="Stop treating this role as tournament admins",
+    announce_channel="Channel for tournament start and final standings announcements",
+    clear_announce_channel="Stop posting announcements",
+)
+async def tournament_settings(
+    interaction: discord.Interaction,
+    add_admin_role: discord.Role | None = None,
+    remove_admin_role: discord.Role | None = None,
+    announce_channel: discord.TextChannel | None = None,
+    clear_announce_channel: bool = False,
+) -> None:
+    partition = GuildData.get(interaction.guild_id)
+    if add_admin_role is not None:
+        partition.set_admin_role(add_admin_role.id, True)
+    if remove_admin_role is not None:
+        partition.set_admin_role(remove_admin_role.id, False)
+    if announce_channel is not None:
+        partition.set_announce_channel(announce_channel.id)
+    elif clear_announce_channel:
+        partition.set_announce_channel(None)
+
+    roles = ", ".join(f"<@&{role_id}>" for role_id in sorted(partition.admin_role_ids)) or "None (Manage Server only)"
+    channel_id = partition.announce_channel_id
+    await interaction.response.send_message(
+        f"**Admin roles:** {roles}\n**Announcements:** {f'<#{channel_id}>' if channel_id else 'Off'}",
+        ephemeral=True,
+        allowed_mentions=discord.AllowedMentions.none(),
+    )
+
+def _announcement_channel(bot: discord.Client, guild_id: int) -> discord.abc.Messageable | None:
+    channel_id = GuildData.get(guild_id).announce_channel_id
+    if channel_id is None:
+        return None
+    channel = bot.get_channel(channel_id)
+    if not isinstance(channel, discord.abc.Messageable):
+        log.warning("Announcement channel %s of guild %s not found or not a text channel", channel_id, guild_id)
+        return None
+    return channel
+
+
+def _split_tournament_key(key: str) -> tuple[int, str]:
+    guild_id, _, name = key.partition("/")
+    return int(guild_id), name
+
+
+def _update_posted_leaderboards(bot: discord.Client, partition: GuildData, name: str, embed: discord.Embed) -> int:
+    """Queue edits for the registered leaderboard messages of `name` that don't show `embed` yet."""
+    fingerprint = _embed_fingerprint(embed)
+    edited = 0
+    for message_id, entry in partition.leaderboards_for(name).items():
+        if entry.get("fingerprint") == fingerprint:
+            continue
+        channel = bot.get_channel(entry.get("channelId"))
+        if isinstance(channel, discord.abc.Messageable):
+            message = channel.get_partial_message(int(message_id))
+            edit = bot.edit_scheduler.submit(message, embed=embed)
+            edit.add_done_callback(
+                functools.partial(_posted_leaderboard_edited, partition, int(message_id), fingerprint)
+            )
+            edited += 1
+    return edited
+
+
+def _posted_leaderboard_edited(partition: GuildData, message_id: int, fingerprint: str, edit: asyncio.Future) -> None:
+    """Record a sent edit; forget messages that were deleted or can no longer be reached."""
+    if edit.cancelled():
+        return
+    error = edit.exception()
+    if error is None:
+        partition.update_fingerprint(message_id, fingerprint)
+    elif isinstance(error, (discord.NotFound, discord.Forbidden)):
+        log.info("Posted leaderboard %s is gone (%s); no longer updating it", message_id, error)
+        partition.remove_leaderboard(message_id)
+    # Other failures are logged by the scheduler and retried on the next update
+
+
+def _register_warmup(bot: discord.Client) -> None:
+    async def warm_active_tournaments(warmer: CacheWarmer) -> None:
+        active = [
+            tournament
+            for guild_id in GuildData.known_guild_ids()
+            for tournament in TournamentsFile.for_guild(guild_id).get_tournaments()
+        ]
+        if not active:
+            return
+        # Linked accounts of players registered through Discord, used by Join and /me
+        discord_ids = {
+            player["discordId"]
+            for tournament in active
+            for player in (tournament.get("players") or {}).values()
+            if (player or {}).get("discordId")
+        }
+        await warmer.run_limited(functools.partial(bot.identities.get_by_discord_id, key) for key in discord_ids)
+
+        async def render(tournament: dict) -> None:
+            # Fills the leaderboard cache; also backfills map metadata and seeds the live score snapshot
+            embed = _label_leaderboard(await _cache_leaderboard_render(bot, tournament))
+            partition = GuildData.get(tournament["guildId"])
+            _update_posted_leaderboards(bot, partition, tournament.get("name", ""), embed)
+
+        await warmer.run_limited(functools.partial(render, tournament) for tournament in active)
+        log.info("Warmed %d active tournaments", len(active))
+
+    bot.warmer.add_job("tournaments", warm_active_tournaments)
+
+
+def _register_lifecycle_hooks(bot: discord.Client) -> None:
+    async def announce_start(key: str) -> None:
+        guild_id, name = _split_tournament_key(key)
+        channel = _announcement_channel(bot, guild_id)
+        if channel is None:
+            return
+        tournament = TournamentsFile.for_guild(guild_id).get_tournament(name)
+        await channel.send(
+            f"**{name}** has started and ends {_discord_timestamp(tournament.get('endDate'), 'R')}. "
+            f"Join with {get_command_mentions('tournaments')}."
+        )
+
+    async def snapshot_final_leaderboard(key: str) -> None:
+        guild_id, name = _split_tournament_key(key)
+        store = TournamentsFile.for_guild(guild_id)
+        partition = GuildData.get(guild_id)
+        tournament = store.get_tournament(name)
+        embed = await _render_tournament_detail_embed(bot, tournament)
+        embed.title = f"{embed.title} (final)"
+        # Only the snapshot is written, merged into the stored record
+        store.save_tournament(name=name, finalLeaderboard=embed.to_dict())
+
+        # Leave the posted leaderboards showing the final standings
+        _update_posted_leaderboards(bot, partition, name, embed)
+
+        channel = _announcement_channel(bot, guild_id)
+        if channel is not None:
+            await channel.send(content=f"**{name}** has ended. Final standings:", embed=embed)
+
+    bot.lifecycle.add_hook("start", announce_start)
+    bot.lifecycle.add_hook("end", snapshot_final_leaderboard)
+
+
 def setup(bot: discord.Client) -> None:
     bot.tree.add_command(tournaments)
+    bot.tree.add_command(tournament_settings)
+    _register_lifecycle_hooks(bot)
+    _register_warmup(bot)
+    for guild_id in GuildData.known_guild_ids():
+        hot = TournamentsFile.for_guild(guild_id).get_tournaments(include_upcoming=True)
+        bot.lifecycle.load(hot, key=_tournament_key)
+        if bot.live_scores is not None:
+            for tournament in hot:
+                bot.live_scores.track(_tournament_key(tournament), tournament)
+    bot.memory_report.register(
+        "tournaments",
+        lambda: {
+            "guild_partitions": len(GuildData._partitions),
+            "hot_records": [store._hot_records for store in TournamentsFile._stores.values()],
+            "leaderboards": [partition.leaderboards for partition in GuildData._partitions.values()],
+        },
+    )
     # Persistent view so the public leaderboard Refresh button still works after bot restart
     bot.add_view(LeaderboardPublicView(tournament_name=""))
@@ -1,12 +1,18 @@
 import aiohttp
 import asyncio
 
+import json_codec
+from cassette import Cassette
+from http_cache import ConditionalCache
+
 base_url = "https://api.beatleader.xyz/"
 
 class BeatLeaderClient:
-    def __init__(self, session: aiohttp.ClientSession | None = None):
+    def __init__(self, session: aiohttp.ClientSession | None = None, cassette: Cassette | None = None):
         self._session = session
         self._owns_session = session is None
+        self.cassette = cassette
+        self.http_cache = ConditionalCache()
 
     async def __aenter__(self):
         await self._ensure_session()
@@ -24,15 +30,40 @@ class BeatLeaderClient:
         if self._session and not self._session.closed:
             await self._session.close()
 
+    def memory_sources(self) -> dict:
+        connector = self._session.connector if self._session and not self._session.closed else None
+        idle = getattr(connector, "_conns", {})
+        return {
+            "idle_connections": sum(len(connections) for connections in idle.values()),
+            "acquired_connections": len(getattr(connector, "_acquired", ())),
+            **self.http_cache.memory_sources(),
+        }
+
     async def _request(self, path: str, **kwargs):
+        if self.cassette is not None:
+            return await self.cassette.wrap(
+                "beatleader", path, kwargs.get("params"), lambda: self._fetch(path, **kwargs)
+            )
+        return await self._fetch(path, **kwargs)
+
+    async def _fetch(self, path: str, **kwargs):
         await self._ensure_session()
-        async with self._session.get(path, **kwargs) as response:
+        key = self.http_cache.key(path, kwargs.get("params"))
+        cached = self.http_cache.get(key)
+        headers = {**kwargs.pop("headers", {}), **(cached.validators() if cached else {})}
+        async with self._session.get(path, headers=headers, **kwargs) as response:
+            if response.status == 304 and cached is not None:
+                await response.read()
+                return self.http_cache.revalidated(cached)
             if response.status == 404:
                 # Consume body so the connection can be reused
                 await response.read()
                 return None
             response.raise_for_status()
-            return await response.json()
+            body = await response.read()
+            data = await json_codec.loads_async(body)
+            self.http_cache.store(key, response.headers, data, len(body))
+            return data
 
     async def get_player_by_discord_id(self, discord_id: str):
         return await self._request(f"player/discord/{discord_id}")
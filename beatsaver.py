@@ -1,12 +1,18 @@
 import aiohttp
 import asyncio
 
+import json_codec
+from cassette import Cassette
+from http_cache import ConditionalCache
+
 base_url = "https://api.beatsaver.com/"
 
 class BeatSaverClient:
-    def __init__(self, session: aiohttp.ClientSession | None = None):
+    def __init__(self, session: aiohttp.ClientSession | None = None, cassette: Cassette | None = None):
         self._session = session
         self._owns_session = session is None
+        self.cassette = cassette
+        self.http_cache = ConditionalCache()
 
     async def __aenter__(self):
         await self._ensure_session()
@@ -24,11 +30,36 @@ class BeatSaverClient:
         if self._session and not self._session.closed:
             await self._session.close()
 
+    def memory_sources(self) -> dict:
+        connector = self._session.connector if self._session and not self._session.closed else None
+        idle = getattr(connector, "_conns", {})
+        return {
+            "idle_connections": sum(len(connections) for connections in idle.values()),
+            "acquired_connections": len(getattr(connector, "_acquired", ())),
+            **self.http_cache.memory_sources(),
+        }
+
     async def _request(self, path: str, **kwargs):
+        if self.cassette is not None:
+            return await self.cassette.wrap(
+                "beatsaver", path, kwargs.get("params"), lambda: self._fetch(path, **kwargs)
+            )
+        return await self._fetch(path, **kwargs)
+
+    async def _fetch(self, path: str, **kwargs):
         await self._ensure_session()
-        async with self._session.get(path, **kwargs) as response:
+        key = self.http_cache.key(path, kwargs.get("params"))
+        cached = self.http_cache.get(key)
+        headers = {**kwargs.pop("headers", {}), **(cached.validators() if cached else {})}
+        async with self._session.get(path, headers=headers, **kwargs) as response:
+            if response.status == 304 and cached is not None:
+                await response.read()
+                return self.http_cache.revalidated(cached)
             response.raise_for_status()
-            return await response.json()
+            body = await response.read()
+            data = await json_codec.loads_async(body)
+            self.http_cache.store(key, response.headers, data, len(body))
+            return data
 
     async def get_maps_by_ids(self, map_ids: list[str]):
         if not map_ids:
@@ -42,7 +73,37 @@ class BeatSaverClient:
         if not hash:
             raise ValueError("hash must be a non-empty string.")
         return await self._request(f"maps/hash/{hash}")
-    
+
+
+def summarize_map(map_doc: dict, hash: str, difficulty: str, characteristic: str) -> dict:
+    """
+    Extract the per-map fields a tournament stores from a BeatSaver map document.
+
+    Returns the BeatSaver key, song name, cover URL, note count and max score of
+    the version matching `hash` and the given difficulty/characteristic. Fields
+    that can't be found are None.
+    """
+    summary = {
+        "key": map_doc.get("id", ""),
+        "songName": (map_doc.get("metadata") or {}).get("songName"),
+        "coverURL": None,
+        "notes": None,
+        "maxScore": None,
+    }
+    target_hash = (hash or "").upper()
+    for version in map_doc.get("versions") or []:
+        if str(version.get("hash", "")).upper() != target_hash:
+            continue
+        summary["coverURL"] = version.get("coverURL")
+        for diff in version.get("diffs", []):
+            if diff.get("difficulty") == difficulty and diff.get("characteristic") == characteristic:
+                summary["notes"] = diff.get("notes")
+                summary["maxScore"] = diff.get("maxScore")
+                break
+        break
+    return summary
+
+
 if __name__ == "__main__":
     async def main():
         async with BeatSaverClient() as client:
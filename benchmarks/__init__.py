@@ -0,0 +1 @@
+"""Offline benchmarks for the bot's leaderboard pipeline."""
@@ -0,0 +1,157 @@
+"""Minimal stand-ins for the discord.py objects command handlers touch."""
+from __future__ import annotations
+
+import itertools
+import os
+import time
+from types import SimpleNamespace
+
+import aiohttp
+
+from beatleader import BeatLeaderClient
+from beatsaver import BeatSaverClient
+from cassette import Cassette
+from edit_scheduler import MessageEditScheduler
+from identities import IdentityCache
+from leaderboard_cache import LeaderboardCache
+from lifecycle import LifecycleScheduler
+from memory_report import MemoryReporter
+from score_history import ScoreHistory
+from warmup import CacheWarmer
+
+_ids = itertools.count(1)
+
+# Every fake interaction happens in this guild
+BENCH_GUILD_ID = 1
+
+
+class BenchClient:
+    """Carries the services DiscordClient exposes, bound to stand-in APIs and a scratch directory."""
+
+    def __init__(
+        self, beatleader_url: str, beatsaver_url: str, workdir: str, cassette: Cassette | None = None
+    ) -> None:
+        self.cassette = cassette
+        self.beatleader = BeatLeaderClient(aiohttp.ClientSession(base_url=beatleader_url), cassette)
+        self.beatsaver = BeatSaverClient(aiohttp.ClientSession(base_url=beatsaver_url), cassette)
+        self.identities = IdentityCache(self.beatleader)
+        self.identities.FILE_PATH = os.path.join(workdir, "identities.json")
+        self.score_history = ScoreHistory(os.path.join(workdir, "score_history"))
+        # Set by scenarios that exercise the websocket feed
+        self.live_scores = None
+        self.leaderboard_cache = LeaderboardCache()
+        self.edit_scheduler = MessageEditScheduler(channel_interval=0.0, global_rate=1_000_000.0)
+        self.lifecycle = LifecycleScheduler()
+        self.memory_report = MemoryReporter()
+        self.warmer = CacheWarmer(start_delay=0.0)
+        self.user = None
+        self.latency = 0.0
+        # Stand-ins that serve attachment downloads and the score stream, set by the benchmark runner
+        self.attachment_host = None
+        self.score_stream_host = None
+
+    async def close(self) -> None:
+        await self.leaderboard_cache.stop()
+        await self.beatleader.close()
+        await self.beatsaver.close()
+
+
+class FakeResponse:
+    """InteractionResponse that records when the interaction was first acknowledged."""
+
+    def __init__(self, interaction: "FakeInteraction") -> None:
+        self._interaction = interaction
+        self._done = False
+        self.calls: list[str] = []
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _ack(self, kind: str) -> None:
+        self.calls.append(kind)
+        if not self._done:
+            self._done = True
+            self._interaction.acked_at = time.perf_counter()
+
+    async def defer(self, **_) -> None:
+        self._ack("defer")
+
+    async def send_message(self, *_, **__) -> None:
+        self._ack("send_message")
+
+    async def edit_message(self, **_) -> None:
+        self._ack("edit_message")
+
+    async def send_modal(self, modal) -> None:
+        self._ack("send_modal")
+        self._interaction.modal = modal
+
+
+class FakeFollowup:
+    def __init__(self) -> None:
+        self.sent: list[dict] = []
+
+    async def send(self, content: str | None = None, **kwargs) -> None:
+        self.sent.append({"content": content, **kwargs})
+
+
+class FakeMessage:
+    def __init__(self, *, channel_id: int = 1, embeds: list | None = None) -> None:
+        self.id = next(_ids)
+        self.channel = SimpleNamespace(id=channel_id)
+        self.embeds = embeds or []
+        self.edits = 0
+
+    async def edit(self, **kwargs) -> "FakeMessage":
+        self.edits += 1
+        if kwargs.get("embed") is not None:
+            self.embeds = [kwargs["embed"]]
+        return self
+
+
+class FakeAttachment:
+    def __init__(self, data: bytes, url: str, filename: str = "playlist.bplist") -> None:
+        self.data = data
+        self.url = url
+        self.filename = filename
+        self.size = len(data)
+
+    async def read(self) -> bytes:
+        return self.data
+
+
+class FakeInteraction:
+    """
+    Interaction stand-in with recording response/followup objects.
+
+    `ack_latency` is the time from construction to the first response call.
+    """
+
+    def __init__(self, client: BenchClient, *, user_id: int = 1, message: FakeMessage | None = None) -> None:
+        self.client = client
+        self.id = next(_ids)
+        self.user = SimpleNamespace(id=user_id, roles=[], display_name=f"user{user_id}")
+        self.guild = None
+        self.guild_id = BENCH_GUILD_ID
+        self.channel = None
+        self.message = message
+        self.modal = None
+        self.response = FakeResponse(self)
+        self.followup = FakeFollowup()
+        self.created_at = time.perf_counter()
+        self.acked_at: float | None = None
+        self.original_edits = 0
+
+    @property
+    def ack_latency(self) -> float | None:
+        if self.acked_at is None:
+            return None
+        return self.acked_at - self.created_at
+
+    async def edit_original_response(self, **_) -> None:
+        self.original_edits += 1
+
+
+def fill_text_input(text_input, value: str) -> None:
+    """Set a modal TextInput's submitted value, as discord.py does when a modal is submitted."""
+    text_input._value = value
@@ -0,0 +1,252 @@
+"""
+Benchmark the leaderboard pipeline against local BeatLeader/BeatSaver stand-ins.
+
+Run from the repository root:
+
+    python -m benchmarks.leaderboard --grid 10x10,50x25,200x50 --latency 0.002
+
+Each scenario runs with cold caches in a scratch directory and reports wall
+time, the number of requests the stand-ins served, and peak traced memory.
+--record saves every API response to a cassette; --replay serves a run
+from one instead of the stand-ins (optionally at recorded latencies).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.fakes import BENCH_GUILD_ID, BenchClient, FakeAttachment, FakeInteraction, fill_text_input
+from benchmarks.stand_ins import (
+    BeatLeaderStandIn,
+    BeatSaverStandIn,
+    map_document,
+    map_hash,
+    map_key,
+    player_id,
+    player_name,
+)
+from beatsaver import summarize_map
+from cassette import Cassette
+from guild_data import GuildData
+from live_scores import LiveScoreFeed
+from Commands.parse_playlist import parse_playlist_command
+from Commands.tournaments import (
+    RegisterPlayerModal,
+    TournamentDetailView,
+    TournamentsFile,
+    build_tournament_detail_embed,
+)
+
+DEFAULT_GRID = "10x10,50x25,200x50"
+
+
+def make_maps(maps: int) -> dict:
+    config = {}
+    for index in range(maps):
+        config[map_key(index)] = {
+            "name": f"Song {index}",
+            "author": "Mapper",
+            "characteristic": "Standard",
+            "difficulty": "Expert",
+            "hash": map_hash(index),
+            **summarize_map(map_document(index), map_hash(index), "Expert", "Standard"),
+        }
+    return config
+
+
+def make_tournament(players: int, maps: int) -> dict:
+    return {
+        "guildId": BENCH_GUILD_ID,
+        "name": f"Bench {players}x{maps}",
+        "startDate": 0,
+        "endDate": 4102444800,
+        "maps": make_maps(maps),
+        "players": {
+            str(index): {"beatleaderUsername": player_name(index), "beatleaderId": player_id(index)}
+            for index in range(players)
+        },
+    }
+
+
+def make_playlist(maps: int) -> bytes:
+    songs = [
+        {
+            "hash": map_hash(index),
+            "songName": f"Song {index}",
+            "levelAuthorName": "Mapper",
+            "difficulties": [{"name": "Expert", "characteristic": "Standard"}],
+        }
+        for index in range(maps)
+    ]
+    return json.dumps({"playlistTitle": "Bench", "playlistAuthor": "bench", "songs": songs}).encode("utf-8")
+
+
+async def bench_detail_embed(client: BenchClient, players: int, maps: int) -> None:
+    await build_tournament_detail_embed(FakeInteraction(client), make_tournament(players, maps))
+
+
+async def bench_parse_playlist(client: BenchClient, players: int, maps: int) -> None:
+    data = make_playlist(maps)
+    url = client.attachment_host.host_attachment("playlist.bplist", data)
+    await parse_playlist_command.callback(FakeInteraction(client), FakeAttachment(data, url))
+
+
+async def bench_register_players(client: BenchClient, players: int, maps: int) -> None:
+    tournament = make_tournament(0, maps)
+    TournamentsFile.for_guild(BENCH_GUILD_ID).save_tournament(
+        name=tournament["name"],
+        startDate=tournament["startDate"],
+        endDate=tournament["endDate"],
+        maps=tournament["maps"],
+    )
+    parent = FakeInteraction(client)
+    view = TournamentDetailView(TournamentsFile.for_guild(BENCH_GUILD_ID).get_tournament(tournament["name"]), parent)
+    modal = RegisterPlayerModal(view)
+    # Mix Discord ids and usernames, like a pasted roster
+    lines = [str(index) if index % 2 else player_name(index) for index in range(players)]
+    fill_text_input(modal.discord_id_input, "\n".join(lines))
+    await modal.on_submit(FakeInteraction(client))
+
+
+async def bench_live_scores(client: BenchClient, players: int, maps: int) -> None:
+    """Render once (polling), push a new score for every cell over the websocket, render again."""
+    host = client.score_stream_host
+    host.pushed.clear()
+    feed = LiveScoreFeed(host.socket_url)
+    client.live_scores = feed
+    feed.start()
+    try:
+        async with asyncio.timeout(10):
+            while not feed.connected:
+                await asyncio.sleep(0.01)
+        tournament = make_tournament(players, maps)
+        await build_tournament_detail_embed(FakeInteraction(client), tournament)
+        for player in range(players):
+            for map_number in range(maps):
+                await host.push_score(player, map_number, 500000 + player * maps + map_number)
+        async with asyncio.timeout(10):
+            while feed.matched < players * maps:
+                await asyncio.sleep(0.01)
+        requests_before = host.request_count
+        embed = await build_tournament_detail_embed(FakeInteraction(client), tournament)
+        if host.request_count != requests_before:
+            raise RuntimeError("render after live updates still polled BeatLeader")
+        if players and maps and not any("↑" in field.value for field in embed.fields):
+            raise RuntimeError("render after live updates did not mark improved scores")
+    finally:
+        await feed.stop()
+        client.live_scores = None
+
+
+SCENARIOS = {
+    "detail_embed": bench_detail_embed,
+    "parse_playlist": bench_parse_playlist,
+    "register_players": bench_register_players,
+    "live_scores": bench_live_scores,
+}
+
+
+def parse_grid(value: str) -> list[tuple[int, int]]:
+    grid = []
+    for cell in value.split(","):
+        players, _, maps = cell.strip().lower().partition("x")
+        grid.append((int(players), int(maps)))
+    return grid
+
+
+async def run(args: argparse.Namespace) -> list[dict]:
+    stand_in_options = {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+    }
+    cassette = None
+    if args.record:
+        cassette = Cassette(args.record, "record")
+    elif args.replay:
+        cassette = Cassette(args.replay, "replay-realtime" if args.realtime else "replay")
+
+    results: list[dict] = []
+    async with BeatLeaderStandIn(**stand_in_options) as beatleader, BeatSaverStandIn(**stand_in_options) as beatsaver:
+        for name in args.scenario:
+            for players, maps in parse_grid(args.grid):
+                with tempfile.TemporaryDirectory() as workdir:
+                    guild_directory = GuildData.DIRECTORY
+                    GuildData.DIRECTORY = os.path.join(workdir, "guilds")
+                    client = BenchClient(beatleader.url, beatsaver.url, workdir, cassette)
+                    client.attachment_host = beatsaver
+                    client.score_stream_host = beatleader
+                    beatleader.reset_counters()
+                    beatsaver.reset_counters()
+                    tracemalloc.start()
+                    start = time.perf_counter()
+                    outcome = "ok"
+                    try:
+                        await SCENARIOS[name](client, players, maps)
+                    except Exception as exc:
+                        # Injected errors may abort a scenario; report it instead of stopping the run.
+                        outcome = type(exc).__name__
+                    finally:
+                        wall = time.perf_counter() - start
+                        _, peak = tracemalloc.get_traced_memory()
+                        tracemalloc.stop()
+                        GuildData.DIRECTORY = guild_directory
+                        await client.close()
+
+                errors = sum(
+                    count
+                    for stand_in in (beatleader, beatsaver)
+                    for status, count in stand_in.status_counts.items()
+                    if status >= 400 and status != 404
+                )
+                results.append(
+                    {
+                        "scenario": name,
+                        "players": players,
+                        "maps": maps,
+                        "wall_s": round(wall, 4),
+                        "requests": beatleader.request_count + beatsaver.request_count,
+                        "errors": errors,
+                        "peak_kib": round(peak / 1024, 1),
+                        "outcome": outcome,
+                    }
+                )
+    if cassette is not None:
+        cassette.save()
+    return results
+
+
+def format_table(results: list[dict]) -> str:
+    headers = ["scenario", "players", "maps", "wall_s", "requests", "errors", "peak_kib", "outcome"]
+    rows = [[str(result[header]) for header in headers] for result in results]
+    widths = [max(len(header), *(len(row[column]) for row in rows)) for column, header in enumerate(headers)]
+    lines = ["  ".join(header.ljust(width) for header, width in zip(headers, widths))]
+    lines.extend("  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows)
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--grid", default=DEFAULT_GRID, help="Comma separated PLAYERSxMAPS cells")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=sorted(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.002, help="Seconds added to every stand-in response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="PATH", help="Record API responses to a cassette file")
+    cassette_group.add_argument("--replay", metavar="PATH", help="Serve API responses from a cassette file")
+    parser.add_argument("--realtime", action="store_true", help="With --replay, wait for the recorded latencies")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(json.dumps(results, indent=2) if args.json else format_table(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Drive slash commands and UI callbacks concurrently against local API stand-ins.
+
+Run from the repository root:
+
+    python -m benchmarks.load_test --count 500 --concurrency 50 \
+        --mix tournaments=1,refresh=4,join=1,me=2 --players 50 --maps 10
+
+Each interaction is a FakeInteraction handed straight to the handler.
+Reports throughput, acknowledgement latency percentiles per handler and
+event-loop lag sampled while the load runs.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+
+from benchmarks.fakes import BENCH_GUILD_ID, BenchClient, FakeInteraction, FakeMessage
+from benchmarks.leaderboard import make_tournament
+from benchmarks.stand_ins import BeatLeaderStandIn, BeatSaverStandIn
+from guild_data import GuildData
+from Commands.me import me_command
+from loop_monitor import LoopMonitor
+from Commands.tournaments import (
+    LeaderboardPublicView,
+    TournamentDetailView,
+    TournamentsFile,
+    tournaments,
+)
+
+DEFAULT_MIX = "tournaments=1,refresh=4,join=1,me=2"
+
+# Discord ids handed to Join and /me; the BeatLeader stand-in links every numeric id.
+_user_ids = itertools.count(100000)
+
+
+async def run_tournaments(client: BenchClient, tournament: dict, message: FakeMessage) -> FakeInteraction:
+    interaction = FakeInteraction(client)
+    await tournaments.callback(interaction)
+    return interaction
+
+
+async def run_refresh(client: BenchClient, tournament: dict, message: FakeMessage) -> FakeInteraction:
+    interaction = FakeInteraction(client, message=message)
+    view = LeaderboardPublicView(tournament_name=tournament["name"])
+    await view.refresh_scores.callback(interaction)
+    return interaction
+
+
+async def run_join(client: BenchClient, tournament: dict, message: FakeMessage) -> FakeInteraction:
+    interaction = FakeInteraction(client, user_id=next(_user_ids))
+    view = TournamentDetailView(TournamentsFile.for_guild(BENCH_GUILD_ID).get_tournament(tournament["name"]), interaction)
+    await view.join_tournament.callback(interaction)
+    return interaction
+
+
+async def run_me(client: BenchClient, tournament: dict, message: FakeMessage) -> FakeInteraction:
+    interaction = FakeInteraction(client, user_id=next(_user_ids))
+    await me_command.callback(interaction)
+    return interaction
+
+
+HANDLERS = {
+    "tournaments": run_tournaments,
+    "refresh": run_refresh,
+    "join": run_join,
+    "me": run_me,
+}
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix: dict[str, float] = {}
+    for part in value.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in HANDLERS:
+            raise argparse.ArgumentTypeError(f"Unknown handler '{name}', expected one of {', '.join(HANDLERS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(args: argparse.Namespace) -> dict:
+    mix = parse_mix(args.mix)
+    names = list(mix)
+    rng = random.Random(args.seed)
+    plan = rng.choices(names, weights=[mix[name] for name in names], k=args.count)
+
+    stand_in_options = {
+        "latency": args.latency,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+    }
+    ack_latencies: dict[str, list[float]] = defaultdict(list)
+    failures: dict[str, int] = defaultdict(int)
+
+    async with BeatLeaderStandIn(**stand_in_options) as beatleader, BeatSaverStandIn(**stand_in_options) as beatsaver:
+        with tempfile.TemporaryDirectory() as workdir:
+            guild_directory = GuildData.DIRECTORY
+            GuildData.DIRECTORY = os.path.join(workdir, "guilds")
+            client = BenchClient(beatleader.url, beatsaver.url, workdir)
+            tournament = make_tournament(args.players, args.maps)
+            TournamentsFile.for_guild(tournament.pop("guildId")).save_tournament(**tournament)
+            message = FakeMessage()
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def _fire(name: str) -> None:
+                async with semaphore:
+                    try:
+                        interaction = await HANDLERS[name](client, tournament, message)
+                    except Exception:
+                        failures[name] += 1
+                        return
+                    if interaction.ack_latency is not None:
+                        ack_latencies[name].append(interaction.ack_latency)
+
+            monitor = LoopMonitor(interval=0.01)
+            monitor.start()
+            start = time.perf_counter()
+            try:
+                await asyncio.gather(*(_fire(name) for name in plan))
+            finally:
+                wall = time.perf_counter() - start
+                await monitor.stop()
+                GuildData.DIRECTORY = guild_directory
+                await client.close()
+
+    all_latencies = [value for values in ack_latencies.values() for value in values]
+    return {
+        "interactions": args.count,
+        "wall_s": round(wall, 3),
+        "throughput_per_s": round(args.count / wall, 1) if wall else None,
+        "requests": beatleader.request_count + beatsaver.request_count,
+        "message_edits": message.edits,
+        "ack_ms": {
+            name: {
+                "count": len(ack_latencies[name]),
+                "failed": failures[name],
+                "p50": round(percentile(ack_latencies[name], 0.50) * 1000, 2),
+                "p90": round(percentile(ack_latencies[name], 0.90) * 1000, 2),
+                "p99": round(percentile(ack_latencies[name], 0.99) * 1000, 2),
+            }
+            for name in names
+        },
+        "ack_ms_overall_p99": round(percentile(all_latencies, 0.99) * 1000, 2),
+        "loop_lag_ms": {name: round(value * 1000, 2) for name, value in monitor.percentiles().items()},
+        "loop_blocked": monitor.blocked_count,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=200, help="Total interactions to fire")
+    parser.add_argument("--concurrency", type=int, default=25, help="Interactions in flight at once")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Comma separated handler=weight pairs")
+    parser.add_argument("--players", type=int, default=20, help="Players registered in the load-test tournament")
+    parser.add_argument("--maps", type=int, default=5, help="Maps in the load-test tournament")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds added to every stand-in response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""Local aiohttp stand-ins for the BeatLeader and BeatSaver endpoints the API clients use."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import random
+from collections import Counter
+
+from aiohttp import web
+
+
+def map_key(index: int) -> str:
+    return f"b{index:x}"
+
+
+def map_hash(index: int) -> str:
+    return f"{index:040X}"
+
+
+def map_index(value: str) -> int:
+    """Inverse of map_key/map_hash."""
+    return int(value[1:] if value.startswith("b") else value, 16)
+
+
+def player_id(index: int) -> str:
+    return str(76561198000000000 + index)
+
+
+def player_name(index: int) -> str:
+    return f"player{index}"
+
+
+def map_document(index: int) -> dict:
+    return {
+        "id": map_key(index),
+        "name": f"Song {index}",
+        "metadata": {"songName": f"Song {index}", "levelAuthorName": "Mapper"},
+        "versions": [
+            {
+                "hash": map_hash(index),
+                "coverURL": f"https://cdn.example/{map_hash(index)}.jpg",
+                "diffs": [
+                    {"difficulty": "Expert", "characteristic": "Standard", "notes": 500 + index, "maxScore": 460000 + index * 920},
+                    {"difficulty": "ExpertPlus", "characteristic": "Standard", "notes": 700 + index, "maxScore": 644000 + index * 920},
+                ],
+            }
+        ],
+    }
+
+
+def player_profile(index: int) -> dict:
+    return {
+        "id": player_id(index),
+        "name": player_name(index),
+        "avatar": "https://cdn.example/avatar.png",
+        "country": "US",
+        "rank": index + 1,
+        "countryRank": index + 1,
+        "pp": 10000.0 - index,
+        "playCount": 100,
+        "hoursPlayed": 10.0,
+        "clans": [],
+    }
+
+
+class StandInAPI:
+    """
+    Base for a local stand-in service.
+
+    Every request is counted, delayed by `latency` seconds, and then either
+    answered with 429 (probability `rate_limit_rate`, with a Retry-After
+    header), 500 (probability `error_rate`), or passed to the route handler.
+    With `etags`, JSON responses carry an ETag and conditional requests for
+    unchanged bodies are answered with 304.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+        etags: bool = True,
+    ) -> None:
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.etags = etags
+        self.request_count = 0
+        self.bytes_served = 0
+        self.status_counts: Counter[int] = Counter()
+        self._random = random.Random(seed)
+        self.attachments: dict[str, bytes] = {}
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    def routes(self) -> list[web.RouteDef]:
+        raise NotImplementedError
+
+    def host_attachment(self, name: str, data: bytes) -> str:
+        """Serve `data` at a URL on this stand-in, like a Discord attachment CDN link."""
+        self.attachments[name] = data
+        return f"{self.url}attachments/{name}"
+
+    async def _attachment(self, request: web.Request) -> web.Response:
+        data = self.attachments.get(request.match_info["name"])
+        if data is None:
+            raise web.HTTPNotFound()
+        return web.Response(body=data, content_type="application/octet-stream")
+
+    def reset_counters(self) -> None:
+        self.request_count = 0
+        self.bytes_served = 0
+        self.status_counts.clear()
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.request_count += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        roll = self._random.random()
+        if roll < self.rate_limit_rate:
+            response = web.json_response(
+                {"message": "Too many requests"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        elif roll < self.rate_limit_rate + self.error_rate:
+            response = web.json_response({"message": "Internal error"}, status=500)
+        else:
+            response = self._conditional(request, await handler(request))
+        self.status_counts[response.status] += 1
+        if isinstance(response, web.Response) and isinstance(response.body, bytes):
+            self.bytes_served += len(response.body)
+        return response
+
+    def _conditional(self, request: web.Request, response: web.StreamResponse) -> web.StreamResponse:
+        """Tag JSON responses with an ETag and answer a matching If-None-Match with 304."""
+        if not self.etags or response.status != 200 or not isinstance(response, web.Response):
+            return response
+        if response.content_type != "application/json" or not isinstance(response.body, bytes):
+            return response
+        etag = f'"{hashlib.sha1(response.body).hexdigest()}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return response
+
+    async def start(self) -> str:
+        app = web.Application(middlewares=[self._middleware])
+        app.add_routes(self.routes())
+        app.add_routes([web.get("/attachments/{name}", self._attachment)])
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}/"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "StandInAPI":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.stop()
+
+
+class BeatLeaderStandIn(StandInAPI):
+    """
+    Serves the BeatLeader routes used by BeatLeaderClient.
+
+    Discord ids and player ids map to player{n}; usernames are found by the
+    same naming. Scores are deterministic per player/map, and every seventh
+    player has no score on a given map (404), like an unplayed map.
+
+    /scores is a websocket like BeatLeader's live score stream; push_score
+    sends a score to every connected socket and serves it from scorevalue
+    afterwards.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.sockets: set[web.WebSocketResponse] = set()
+        self.pushed: dict[tuple[str, str, str, str], int] = {}
+
+    @property
+    def socket_url(self) -> str:
+        return self.url.replace("http://", "ws://", 1) + "scores"
+
+    def routes(self) -> list[web.RouteDef]:
+        return [
+            web.get("/player/discord/{discord_id}", self.player_by_discord),
+            web.get("/players", self.search_players),
+            web.get("/player/{player_id}/scorevalue/{hash}/{difficulty}/{characteristic}", self.score_value),
+            web.get("/scores", self.score_socket),
+        ]
+
+    async def score_socket(self, request: web.Request) -> web.WebSocketResponse:
+        socket = web.WebSocketResponse()
+        await socket.prepare(request)
+        self.sockets.add(socket)
+        try:
+            async for _ in socket:
+                pass
+        finally:
+            self.sockets.discard(socket)
+        return socket
+
+    async def push_score(
+        self,
+        player: int,
+        map_number: int,
+        score: int,
+        *,
+        accuracy: float = 0.9,
+        difficulty: str = "Expert",
+        characteristic: str = "Standard",
+    ) -> None:
+        self.pushed[(player_id(player), map_hash(map_number), difficulty, characteristic)] = score
+        payload = {
+            "playerId": player_id(player),
+            "baseScore": score,
+            "modifiedScore": score,
+            "accuracy": accuracy,
+            "leaderboard": {
+                "song": {"hash": map_hash(map_number)},
+                "difficulty": {"difficultyName": difficulty, "modeName": characteristic},
+            },
+        }
+        for socket in list(self.sockets):
+            await socket.send_json(payload)
+
+    async def player_by_discord(self, request: web.Request) -> web.Response:
+        discord_id = request.match_info["discord_id"]
+        if not discord_id.isdigit():
+            raise web.HTTPNotFound()
+        return web.json_response(player_profile(int(discord_id)))
+
+    async def search_players(self, request: web.Request) -> web.Response:
+        search = request.query.get("search", "")
+        if not search.startswith("player") or not search[6:].isdigit():
+            return web.json_response({"data": []})
+        return web.json_response({"data": [player_profile(int(search[6:]))]})
+
+    async def score_value(self, request: web.Request) -> web.Response:
+        info = request.match_info
+        pushed = self.pushed.get((info["player_id"], info["hash"], info["difficulty"], info["characteristic"]))
+        if pushed is not None:
+            return web.json_response(pushed)
+        index = int(request.match_info["player_id"]) - int(player_id(0))
+        map_number = map_index(request.match_info["hash"])
+        if (index + map_number) % 7 == 0:
+            raise web.HTTPNotFound()
+        return web.json_response(400000 + (index * 7919 + map_number * 104729) % 60000)
+
+
+class BeatSaverStandIn(StandInAPI):
+    """Serves the BeatSaver routes used by BeatSaverClient for maps built by map_document()."""
+
+    def routes(self) -> list[web.RouteDef]:
+        return [
+            web.get("/maps/ids/{ids}", self.maps_by_ids),
+            web.get("/maps/hash/{hash}", self.map_by_hash),
+        ]
+
+    async def maps_by_ids(self, request: web.Request) -> web.Response:
+        ids = request.match_info["ids"].split(",")
+        return web.json_response({key: map_document(map_index(key)) for key in ids if key})
+
+    async def map_by_hash(self, request: web.Request) -> web.Response:
+        return web.json_response(map_document(map_index(request.match_info["hash"])))
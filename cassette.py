@@ -0,0 +1,122 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable
+from urllib.parse import urlencode
+
+import aiohttp
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+log = logging.getLogger(__name__)
+
+MODES = ("record", "replay", "replay-realtime")
+
+
+class CassetteMiss(LookupError):
+    """Raised in replay mode for a request that was never recorded."""
+
+
+class Cassette:
+    """
+    Record/replay store for API client requests.
+
+    In "record" mode every request made through `wrap` is performed for real
+    and its status, decoded body and latency are kept. `save` writes them as
+    gzipped JSON. In "replay" mode requests are answered from the file
+    without touching the network; "replay-realtime" also sleeps for the
+    recorded latency. Repeated requests replay their recordings in order,
+    staying on the last one once exhausted.
+
+    Clients pick this up from the HTTP_CASSETTE (path) and HTTP_CASSETTE_MODE
+    environment variables, see `from_env`.
+    """
+
+    def __init__(self, path: str, mode: str = "replay") -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'.")
+        self.path = path
+        self.mode = mode
+        self._entries: dict[str, list[dict]] = {}
+        self._positions: dict[str, int] = {}
+        if mode != "record":
+            self._load()
+
+    @classmethod
+    def from_env(cls) -> "Cassette | None":
+        path = os.getenv("HTTP_CASSETTE")
+        if not path:
+            return None
+        return cls(path, os.getenv("HTTP_CASSETTE_MODE", "replay"))
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @staticmethod
+    def _key(service: str, path: str, params: dict | None) -> str:
+        query = urlencode(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return f"{service} {path}?{query}"
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as file:
+            data = json.load(file)
+        for entry in data.get("interactions", []):
+            self._entries.setdefault(entry["key"], []).append(entry)
+
+    def save(self) -> None:
+        if not self.recording:
+            return
+        interactions = [entry for entries in self._entries.values() for entry in entries]
+        with gzip.open(self.path, "wt", encoding="utf-8") as file:
+            json.dump({"version": 1, "interactions": interactions}, file, separators=(",", ":"))
+        log.info("Saved %s recorded requests to %s", len(interactions), self.path)
+
+    async def wrap(
+        self,
+        service: str,
+        path: str,
+        params: dict | None,
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """Run `fetch` through the cassette: record its outcome, or replay a recorded one."""
+        key = self._key(service, path, params)
+        if not self.recording:
+            return await self._replay(key)
+
+        start = time.perf_counter()
+        try:
+            body = await fetch()
+        except aiohttp.ClientResponseError as exc:
+            self._record(key, exc.status, None, time.perf_counter() - start)
+            raise
+        self._record(key, 200, body, time.perf_counter() - start)
+        return body
+
+    def _record(self, key: str, status: int, body: Any, latency: float) -> None:
+        self._entries.setdefault(key, []).append(
+            {"key": key, "status": status, "body": body, "latency": round(latency, 4)}
+        )
+
+    async def _replay(self, key: str) -> Any:
+        entries = self._entries.get(key)
+        if not entries:
+            raise CassetteMiss(f"No recorded response for {key}")
+        position = self._positions.get(key, 0)
+        entry = entries[min(position, len(entries) - 1)]
+        self._positions[key] = position + 1
+
+        if self.mode == "replay-realtime":
+            await asyncio.sleep(entry["latency"])
+        if entry["status"] >= 400:
+            url = URL(key.split(" ", 1)[1])
+            raise aiohttp.ClientResponseError(
+                aiohttp.RequestInfo(url, "GET", CIMultiDictProxy(CIMultiDict()), url),
+                (),
+                status=entry["status"],
+                message="Replayed error response",
+            )
+        return entry["body"]
@@ -13,6 +13,17 @@ from Commands._helpers import update_command_mentions
 
 from beatsaver import BeatSaverClient
 from beatleader import BeatLeaderClient
+from cassette import Cassette
+from edit_scheduler import MessageEditScheduler
+from guild_data import GuildData
+from identities import IdentityCache
+from leaderboard_cache import LeaderboardCache
+from lifecycle import LifecycleScheduler
+from live_scores import LiveScoreFeed
+from loop_monitor import LoopMonitor
+from memory_report import MemoryReporter
+from score_history import ScoreHistory
+from warmup import CacheWarmer
 
 log = logging.getLogger(__name__)
 
@@ -47,19 +58,57 @@ EVENT_MODULES = _import_modules(EVENT_MODULE_NAMES)
 
 class DiscordClient(commands.Bot):
     def __init__(self) -> None:
-        intents = discord.Intents.default()
-        super().__init__(command_prefix=commands.when_mentioned_or("!"), intents=intents)
+        # The bot only handles interactions. Guild events keep the channel cache used
+        # for announcements; no members, presences or messages are received or cached.
+        intents = discord.Intents.none()
+        intents.guilds = True
+        super().__init__(
+            command_prefix=commands.when_mentioned_or("!"),
+            intents=intents,
+            member_cache_flags=discord.MemberCacheFlags.none(),
+            max_messages=None,
+            chunk_guilds_at_startup=False,
+        )
         self.start_time: int = 0
-        self.beatsaver = BeatSaverClient()
-        self.beatleader = BeatLeaderClient()
+        self.cassette = Cassette.from_env()
+        self.beatsaver = BeatSaverClient(cassette=self.cassette)
+        self.beatleader = BeatLeaderClient(cassette=self.cassette)
+        self.identities = IdentityCache(self.beatleader)
+        self.score_history = ScoreHistory()
+        self.live_scores = LiveScoreFeed.from_env()
+        self.leaderboard_cache = LeaderboardCache.from_env()
+        self.edit_scheduler = MessageEditScheduler()
+        self.loop_monitor = LoopMonitor()
+        self.lifecycle = LifecycleScheduler()
+        self.memory_report = MemoryReporter.from_env()
+        self.warmer = CacheWarmer.from_env()
+        self.memory_report.register("discord_cache", self._discord_cache_sizes)
+        self.memory_report.register("views", self._view_counts)
+        self.memory_report.register("beatleader", self.beatleader.memory_sources)
+        self.memory_report.register("beatsaver", self.beatsaver.memory_sources)
+        self.memory_report.register("identities", self.identities.memory_sources)
+        self.memory_report.register("score_history", self.score_history.memory_sources)
+        self.memory_report.register("leaderboard_cache", self.leaderboard_cache.memory_sources)
+        self.memory_report.register("edit_scheduler", self.edit_scheduler.memory_sources)
+        if self.live_scores is not None:
+            self.memory_report.register("live_scores", self.live_scores.memory_sources)
 
     async def setup_hook(self) -> None:
         self.start_time = int(discord.utils.utcnow().timestamp())
+        self.loop_monitor.start()
+        self.memory_report.start()
+        GuildData.check_legacy()
         await self._register_modules(COMMAND_MODULES, "command")
         await self._register_modules(EVENT_MODULES, "event")
+        # Modules add their lifecycle hooks and tournaments in setup()
+        self.lifecycle.start()
+        if self.live_scores is not None:
+            self.live_scores.start()
         synced = await self.tree.sync()
         update_command_mentions(synced)
         log.info("Synced %s application commands", len(synced))
+        # Modules add their jobs in setup(); runs in the background at low concurrency
+        self.warmer.start()
 
     async def _register_modules(self, modules: Iterable[ModuleType], label: str) -> None:
         for module in modules:
@@ -73,3 +122,39 @@ class DiscordClient(commands.Bot):
             else:
                 setup_callable(self)
             log.info("Registered %s module %s", label, module.__name__)
+
+    def _discord_cache_sizes(self) -> dict:
+        return {
+            "guilds": len(self.guilds),
+            "channels": sum(len(guild.channels) for guild in self.guilds),
+            "users": len(self.users),
+            "messages": len(self.cached_messages),
+        }
+
+    def _view_counts(self) -> dict:
+        # discord.py keeps views that are listening for interactions in its view store
+        store = self._connection._view_store
+        views = {
+            id(item.view): item.view
+            for items in store._views.values()
+            for item in items.values()
+            if item.view is not None
+        }
+        counts: dict[str, int] = {"total": len(views), "modals": len(store._modals)}
+        for view in views.values():
+            name = type(view).__name__
+            counts[name] = counts.get(name, 0) + 1
+        return counts
+
+    async def close(self) -> None:
+        await self.warmer.stop()
+        await self.memory_report.stop()
+        await self.lifecycle.stop()
+        await self.leaderboard_cache.stop()
+        if self.live_scores is not None:
+            await self.live_scores.stop()
+        await self.loop_monitor.stop()
+        self.identities.save()
+        if self.cassette is not None:
+            self.cassette.save()
+        await super().close()
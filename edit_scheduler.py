@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+import discord
+
+log = logging.getLogger(__name__)
+
+
+class _PendingEdit:
+    __slots__ = ("message", "kwargs", "future")
+
+    def __init__(self, message: discord.Message, kwargs: dict, future: asyncio.Future) -> None:
+        self.message = message
+        self.kwargs = kwargs
+        self.future = future
+
+
+class MessageEditScheduler:
+    """
+    Central queue for editing posted leaderboard messages.
+
+    Edits are grouped by channel, which is the rate limit bucket Discord uses
+    for message edits. Only the latest payload per message is kept: submitting
+    again before the edit is sent replaces the payload and keeps its place in
+    the queue. Each channel drains at most one edit per `channel_interval`
+    seconds, and all channels together at most `global_rate` edits per second.
+    """
+
+    def __init__(self, *, channel_interval: float = 1.0, global_rate: float = 20.0) -> None:
+        self.channel_interval = channel_interval
+        self.global_interval = 1.0 / global_rate
+        self._pending: dict[int, OrderedDict[int, _PendingEdit]] = {}
+        self._workers: dict[int, asyncio.Task] = {}
+        self._channel_ready_at: dict[int, float] = {}
+        self._global_ready_at = 0.0
+        self._global_lock = asyncio.Lock()
+
+    def submit(self, message: discord.Message, **kwargs) -> asyncio.Future:
+        """Queue `message.edit(**kwargs)`; the future resolves once this or a newer payload is sent."""
+        channel_id = message.channel.id
+        queue = self._pending.setdefault(channel_id, OrderedDict())
+        pending = queue.get(message.id)
+        if pending is None:
+            pending = _PendingEdit(message, kwargs, asyncio.get_running_loop().create_future())
+            queue[message.id] = pending
+        else:
+            pending.message = message
+            pending.kwargs = kwargs
+
+        worker = self._workers.get(channel_id)
+        if worker is None or worker.done():
+            self._workers[channel_id] = asyncio.create_task(self._drain(channel_id))
+        return pending.future
+
+    async def edit(self, message: discord.Message, **kwargs) -> None:
+        await self.submit(message, **kwargs)
+
+    def memory_sources(self) -> dict:
+        return {
+            "pending": sum(len(queue) for queue in self._pending.values()),
+            "workers": len(self._workers),
+            "channel_ready_at": self._channel_ready_at,
+        }
+
+    async def _wait_global_slot(self) -> None:
+        async with self._global_lock:
+            delay = self._global_ready_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._global_ready_at = time.monotonic() + self.global_interval
+
+    async def _drain(self, channel_id: int) -> None:
+        queue = self._pending[channel_id]
+        try:
+            while queue:
+                delay = self._channel_ready_at.get(channel_id, 0.0) - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self._wait_global_slot()
+
+                # Pop only now so payloads submitted while waiting are still coalesced.
+                _, pending = queue.popitem(last=False)
+                self._channel_ready_at[channel_id] = time.monotonic() + self.channel_interval
+                try:
+                    await pending.message.edit(**pending.kwargs)
+                except Exception as exc:
+                    log.warning("Editing message %s failed: %s", pending.message.id, exc)
+                    if not pending.future.done():
+                        pending.future.set_exception(exc)
+                else:
+                    if not pending.future.done():
+                        pending.future.set_result(None)
+        finally:
+            if not queue:
+                self._pending.pop(channel_id, None)
+            self._workers.pop(channel_id, None)
@@ -0,0 +1,169 @@
+import json
+import logging
+import os
+import shutil
+
+import json_codec
+
+log = logging.getLogger(__name__)
+
+# Files the bot used to keep in the working directory for its only guild
+LEGACY_FILES = ("tournaments.json", "tournaments_archive.json")
+LEGACY_ADMIN_ROLE_ID = 849470981751177267
+
+
+class GuildData:
+    """
+    One guild's storage partition: a directory under DIRECTORY holding that
+    guild's tournaments, settings.json and leaderboards.json. Nothing here
+    touches another guild's files. Updates read, modify and write a file
+    without awaiting in between, so they never interleave on the event loop.
+
+    Settings hold the admin role ids and the announcement channel id. The
+    leaderboard registry maps posted leaderboard message ids to their
+    channel, tournament and last rendered fingerprint.
+
+    Data from before partitioning is moved into the partition of the guild
+    named by the LEGACY_GUILD_ID environment variable.
+    """
+
+    DIRECTORY = "guilds"
+    _partitions: dict[int, "GuildData"] = {}
+
+    def __init__(self, guild_id: int) -> None:
+        self.guild_id = guild_id
+        self.directory = os.path.join(self.DIRECTORY, str(guild_id))
+        self._settings: dict | None = None
+        self._leaderboards: dict[str, dict] | None = None
+
+    @classmethod
+    def known_guild_ids(cls) -> list[int]:
+        """Guilds with a partition on disk, plus the legacy guild if its data has not been moved yet."""
+        guild_ids = set()
+        if os.path.isdir(cls.DIRECTORY):
+            guild_ids.update(int(name) for name in os.listdir(cls.DIRECTORY) if name.isdigit())
+        legacy = os.getenv("LEGACY_GUILD_ID", "")
+        if legacy.isdigit():
+            guild_ids.add(int(legacy))
+        return sorted(guild_ids)
+
+    @classmethod
+    def check_legacy(cls) -> None:
+        """Warn when data from before partitioning exists but no guild is set to receive it."""
+        if os.getenv("LEGACY_GUILD_ID", "").isdigit():
+            return
+        found = [filename for filename in LEGACY_FILES if os.path.exists(filename)]
+        if found:
+            log.warning(
+                "Found legacy %s but LEGACY_GUILD_ID is not set; those tournaments stay hidden "
+                "until it names the guild they belong to",
+                ", ".join(found),
+            )
+
+    @classmethod
+    def get(cls, guild_id: int | None) -> "GuildData":
+        if guild_id is None:
+            raise ValueError("Tournament data is only available in servers.")
+        partition = cls._partitions.get(guild_id)
+        if partition is None or partition.directory != os.path.join(cls.DIRECTORY, str(guild_id)):
+            partition = cls(guild_id)
+            os.makedirs(partition.directory, exist_ok=True)
+            partition._migrate_legacy()
+            cls._partitions[guild_id] = partition
+        return partition
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _migrate_legacy(self) -> None:
+        if os.getenv("LEGACY_GUILD_ID") != str(self.guild_id):
+            return
+        moved = False
+        for filename in LEGACY_FILES:
+            if os.path.exists(filename) and not os.path.exists(self.path(filename)):
+                shutil.move(filename, self.path(filename))
+                moved = True
+        if moved:
+            if not os.path.exists(self.path("settings.json")):
+                self._write("settings.json", {"adminRoleIds": [LEGACY_ADMIN_ROLE_ID]})
+            log.info("Moved legacy tournament data into %s", self.directory)
+
+    def _read(self, filename: str) -> dict:
+        try:
+            with open(self.path(filename), "rb") as file:
+                data = json_codec.loads(file.read())
+        except FileNotFoundError:
+            return {}
+        except (OSError, json.JSONDecodeError):
+            log.warning("Could not read %s, starting empty", self.path(filename))
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _write(self, filename: str, data: dict) -> None:
+        with open(self.path(filename), "wb") as file:
+            file.write(json_codec.dumps(data, indent=True))
+
+    @property
+    def settings(self) -> dict:
+        if self._settings is None:
+            self._settings = self._read("settings.json")
+        return self._settings
+
+    @property
+    def admin_role_ids(self) -> set[int]:
+        return {int(role_id) for role_id in self.settings.get("adminRoleIds", [])}
+
+    def set_admin_role(self, role_id: int, enabled: bool) -> None:
+        role_ids = self.admin_role_ids
+        if enabled:
+            role_ids.add(role_id)
+        else:
+            role_ids.discard(role_id)
+        self.settings["adminRoleIds"] = sorted(role_ids)
+        self._write("settings.json", self.settings)
+
+    @property
+    def announce_channel_id(self) -> int | None:
+        channel_id = self.settings.get("announceChannelId")
+        return int(channel_id) if channel_id is not None else None
+
+    def set_announce_channel(self, channel_id: int | None) -> None:
+        self.settings["announceChannelId"] = channel_id
+        self._write("settings.json", self.settings)
+
+    @property
+    def leaderboards(self) -> dict[str, dict]:
+        if self._leaderboards is None:
+            self._leaderboards = self._read("leaderboards.json")
+        return self._leaderboards
+
+    def register_leaderboard(self, message_id: int, channel_id: int, tournament: str, fingerprint: str) -> None:
+        self.leaderboards[str(message_id)] = {
+            "channelId": channel_id,
+            "tournament": tournament,
+            "fingerprint": fingerprint,
+        }
+        self._write("leaderboards.json", self.leaderboards)
+
+    def get_leaderboard(self, message_id: int) -> dict | None:
+        return self.leaderboards.get(str(message_id))
+
+    def leaderboards_for(self, tournament: str) -> dict[str, dict]:
+        return {
+            message_id: entry
+            for message_id, entry in self.leaderboards.items()
+            if entry.get("tournament") == tournament
+        }
+
+    def update_fingerprint(self, message_id: int, fingerprint: str) -> None:
+        entry = self.leaderboards.get(str(message_id))
+        if entry is not None and entry.get("fingerprint") != fingerprint:
+            entry["fingerprint"] = fingerprint
+            self._write("leaderboards.json", self.leaderboards)
+
+    def remove_leaderboard(self, message_id: int) -> None:
+        if self.leaderboards.pop(str(message_id), None) is not None:
+            self._write("leaderboards.json", self.leaderboards)
+
+    def memory_sources(self) -> dict:
+        return {"settings": self.settings, "leaderboards": self.leaderboards}
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+from typing import Any, Mapping
+
+
+class _Entry:
+    def __init__(self, data: Any, etag: str | None, last_modified: str | None, size: int) -> None:
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = size
+
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ConditionalCache:
+    """
+    Decoded response bodies kept with their HTTP validators.
+
+    Clients send the stored ETag / Last-Modified back as If-None-Match /
+    If-Modified-Since and reuse the stored body when the server answers
+    304 Not Modified, skipping both the download and the JSON decode. Only
+    responses that carry a validator and are at least `min_size` bytes are
+    kept, since revalidating a tiny body saves nothing. The least recently
+    used entries are dropped past `max_entries`. Stored bodies are shared
+    between callers and must not be mutated.
+    """
+
+    def __init__(self, max_entries: int = 1024, min_size: int = 512) -> None:
+        self.max_entries = max_entries
+        self.min_size = min_size
+        self.not_modified = 0
+        self.bytes_saved = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+
+    @staticmethod
+    def key(path: str, params: Mapping | None = None) -> str:
+        if not params:
+            return path
+        return path + "?" + "&".join(f"{name}={params[name]}" for name in sorted(params))
+
+    def get(self, key: str) -> _Entry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key: str, headers: Mapping[str, str], data: Any, size: int) -> None:
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if (etag is None and last_modified is None) or size < self.min_size:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = _Entry(data, etag, last_modified, size)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def revalidated(self, entry: _Entry) -> Any:
+        """Count a 304 answer for `entry` and return its stored body."""
+        self.not_modified += 1
+        self.bytes_saved += entry.size
+        return entry.data
+
+    def memory_sources(self) -> dict:
+        return {
+            "conditional_entries": self._entries,
+            "not_modified": self.not_modified,
+        }
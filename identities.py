@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import time
+
+import json_codec
+from beatleader import BeatLeaderClient
+
+log = logging.getLogger(__name__)
+
+
+class IdentityCache:
+    """
+    Persisted Discord -> BeatLeader identity index.
+
+    Three tables are kept and written to FILE_PATH:
+    - players: BeatLeader id -> {"profile": dict, "fetchedAt": float}
+    - discord: Discord id -> {"playerId": str | None, "fetchedAt": float}
+    - names: lowercased BeatLeader name -> {"playerId": str | None, "fetchedAt": float}
+
+    A `playerId` of None is a negative entry (no linked account / no match).
+    Fresh entries are returned straight from memory. Stale entries are still
+    returned, and a single background refresh is scheduled for them.
+    """
+
+    FILE_PATH = "identities.json"
+    TTL = 6 * 60 * 60
+    NEGATIVE_TTL = 10 * 60
+    SAVE_DELAY = 5.0
+
+    def __init__(self, beatleader: BeatLeaderClient) -> None:
+        self.beatleader = beatleader
+        self._players: dict[str, dict] = {}
+        self._discord: dict[str, dict] = {}
+        self._names: dict[str, dict] = {}
+        self._loaded = False
+        self._inflight: dict[tuple[str, str], asyncio.Task] = {}
+        self._save_task: asyncio.Task | None = None
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.FILE_PATH, "rb") as file:
+                data = json_codec.loads(file.read())
+        except FileNotFoundError:
+            return
+        except (OSError, json.JSONDecodeError):
+            log.warning("Could not read %s, starting with an empty identity cache", self.FILE_PATH)
+            return
+        if not isinstance(data, dict):
+            return
+        self._players = data.get("players") or {}
+        self._discord = data.get("discord") or {}
+        self._names = data.get("names") or {}
+
+    def save(self) -> None:
+        """Write the index to disk immediately."""
+        if not self._loaded:
+            return
+        with open(self.FILE_PATH, "wb") as file:
+            file.write(
+                json_codec.dumps({"players": self._players, "discord": self._discord, "names": self._names})
+            )
+
+    def memory_sources(self) -> dict:
+        return {
+            "players": self._players,
+            "discord": self._discord,
+            "names": self._names,
+            "inflight": len(self._inflight),
+        }
+
+    def _schedule_save(self) -> None:
+        if self._save_task is not None and not self._save_task.done():
+            return
+
+        async def _delayed_save() -> None:
+            await asyncio.sleep(self.SAVE_DELAY)
+            self.save()
+
+        self._save_task = asyncio.create_task(_delayed_save())
+
+    def _is_fresh(self, entry: dict) -> bool:
+        ttl = self.TTL if entry.get("playerId") is not None else self.NEGATIVE_TTL
+        return time.time() - float(entry.get("fetchedAt", 0)) < ttl
+
+    def _profile(self, entry: dict | None) -> dict | None:
+        if entry is None or entry.get("playerId") is None:
+            return None
+        player = self._players.get(entry["playerId"])
+        return player.get("profile") if player else None
+
+    def _remember(self, player: dict | None) -> str | None:
+        if not player or player.get("id") is None:
+            return None
+        player_id = str(player["id"])
+        now = time.time()
+        self._players[player_id] = {"profile": player, "fetchedAt": now}
+        name = player.get("name")
+        if name:
+            self._names[name.lower()] = {"playerId": player_id, "fetchedAt": now}
+        return player_id
+
+    async def _fetch(self, kind: str, key: str) -> dict | None:
+        if kind == "discord":
+            player = await self.beatleader.get_player_by_discord_id(key)
+            table = self._discord
+        else:
+            player = await self.beatleader.get_single_player_by_name(key)
+            table = self._names
+        player_id = self._remember(player)
+        table[key] = {"playerId": player_id, "fetchedAt": time.time()}
+        self._schedule_save()
+        return player
+
+    def _refresh(self, kind: str, key: str) -> asyncio.Task:
+        task = self._inflight.get((kind, key))
+        if task is None or task.done():
+            task = asyncio.create_task(self._fetch(kind, key))
+            task.add_done_callback(lambda t, k=(kind, key): self._on_refresh_done(k, t))
+            self._inflight[(kind, key)] = task
+        return task
+
+    def _on_refresh_done(self, key: tuple[str, str], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("Identity refresh for %s failed: %s", key, task.exception())
+
+    async def _get(self, kind: str, key: str) -> dict | None:
+        self._load()
+        # Pick the table after loading; _load replaces the dicts
+        table = self._discord if kind == "discord" else self._names
+        entry = table.get(key)
+        if entry is None:
+            return await asyncio.shield(self._refresh(kind, key))
+        if not self._is_fresh(entry):
+            self._refresh(kind, key)
+        return self._profile(entry)
+
+    async def get_by_discord_id(self, discord_id: str) -> dict | None:
+        """Return the BeatLeader profile linked to a Discord id, or None when unlinked."""
+        return await self._get("discord", str(discord_id))
+
+    async def get_by_name(self, name: str) -> dict | None:
+        """Return the first BeatLeader player matching a username, or None when not found."""
+        return await self._get("names", name.strip().lower())
@@ -0,0 +1,41 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable
+
+
+class IntervalIndex:
+    """
+    Closed [start, end] intervals, each tagged with a key, sorted by start and
+    by end so time queries bisect to the relevant entries.
+
+    Intended for a small set of live and upcoming intervals; `overlapping`
+    scans the entries that have already started, so finished ones should be
+    moved out of the index (see `ended`).
+    """
+
+    def __init__(self, intervals: Iterable[tuple[float, float, str]] = ()) -> None:
+        self._by_start: list[tuple[float, float, str]] = []
+        self._by_end: list[tuple[float, float, str]] = []
+        for start, end, key in intervals:
+            self._by_start.append((start, end, key))
+            self._by_end.append((end, start, key))
+        self._by_start.sort()
+        self._by_end.sort()
+
+    def __len__(self) -> int:
+        return len(self._by_start)
+
+    def overlapping(self, at: float) -> list[str]:
+        """Keys whose interval contains `at`, in start order."""
+        started = bisect_right(self._by_start, at, key=lambda entry: entry[0])
+        return [key for start, end, key in self._by_start[:started] if end >= at]
+
+    def upcoming(self, after: float, limit: int | None = None) -> list[str]:
+        """Keys of intervals starting after `after`, soonest first."""
+        first = bisect_right(self._by_start, after, key=lambda entry: entry[0])
+        stop = None if limit is None else first + limit
+        return [key for _, _, key in self._by_start[first:stop]]
+
+    def ended(self, before: float) -> list[str]:
+        """Keys of intervals that ended before `before`."""
+        stop = bisect_left(self._by_end, before, key=lambda entry: entry[0])
+        return [key for _, _, key in self._by_end[:stop]]
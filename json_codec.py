@@ -0,0 +1,61 @@
+"""
+JSON encoding/decoding shared by the API clients and the tournament store.
+
+Uses orjson or msgspec when installed and falls back to the standard library.
+Decode errors are always raised as json.JSONDecodeError so callers only need
+to handle one exception type.
+"""
+import asyncio
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+# Payloads larger than this many bytes are decoded in a worker thread by loads_async
+OFFLOAD_THRESHOLD = 256 * 1024
+
+
+def loads(data: bytes | str) -> Any:
+    try:
+        if BACKEND == "orjson":
+            return orjson.loads(data)
+        if BACKEND == "msgspec":
+            return msgspec.json.decode(data)
+        return json.loads(data)
+    except json.JSONDecodeError:
+        raise
+    except ValueError as exc:
+        # msgspec.DecodeError, or UnicodeDecodeError from json.loads on invalid UTF-8
+        raise json.JSONDecodeError(str(exc), "", 0) from exc
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """Encode to UTF-8 JSON; `indent` pretty-prints with two spaces."""
+    if BACKEND == "orjson":
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if BACKEND == "msgspec":
+        encoded = msgspec.json.encode(obj)
+        return msgspec.json.format(encoded, indent=2) if indent else encoded
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+async def loads_async(data: bytes | str) -> Any:
+    """Decode like `loads`, moving large payloads off the event loop."""
+    if len(data) > OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(loads, data)
+    return loads(data)
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+import discord
+
+log = logging.getLogger(__name__)
+
+
+class CachedLeaderboard:
+    def __init__(self, embed: discord.Embed, version: str, computed_at: float) -> None:
+        self.embed = embed
+        # Identifies the tournament setup (players, maps, dates) the embed was rendered from
+        self.version = version
+        self.computed_at = computed_at
+
+    def age(self, now: float | None = None) -> float:
+        return (now if now is not None else time.time()) - self.computed_at
+
+
+Render = Callable[[], Awaitable[discord.Embed]]
+Listener = Callable[[CachedLeaderboard], Awaitable[None]]
+
+
+class LeaderboardCache:
+    """
+    Latest rendered leaderboard per tournament, served stale while revalidating.
+
+    An entry is fresh while it is younger than `max_age` and was rendered
+    from the tournament's current version. Callers serve whatever entry
+    exists and call `revalidate` when it is not fresh. At most one render
+    per tournament key runs at a time, so upstream load is bounded by the
+    revalidation rate rather than the request rate. Listeners are called
+    with the new entry when the render completes, or with the entry already
+    being served when it fails.
+    """
+
+    def __init__(self, *, max_age: float = 60.0, max_entries: int = 256) -> None:
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: OrderedDict[str, CachedLeaderboard] = OrderedDict()
+        self._inflight: dict[str, tuple[str, asyncio.Task]] = {}
+        self._listeners: dict[asyncio.Task, list[Listener]] = {}
+        # Every render still running, including ones superseded by a newer version
+        self._tasks: set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> "LeaderboardCache":
+        """Configured by LEADERBOARD_MAX_AGE (seconds)."""
+        return cls(max_age=float(os.getenv("LEADERBOARD_MAX_AGE", "60")))
+
+    def get(self, key: str) -> CachedLeaderboard | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def is_fresh(self, entry: CachedLeaderboard, version: str) -> bool:
+        return entry.version == version and entry.age() < self.max_age
+
+    def lookup(self, key: str, version: str) -> CachedLeaderboard | None:
+        """`get` that also counts hits, stale hits and misses."""
+        entry = self.get(key)
+        if entry is None:
+            self.misses += 1
+        elif self.is_fresh(entry, version):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    def put(self, key: str, version: str, embed: discord.Embed, computed_at: float | None = None) -> CachedLeaderboard:
+        computed_at = computed_at if computed_at is not None else time.time()
+        current = self._entries.get(key)
+        if current is not None and current.computed_at > computed_at:
+            # A render that started later already landed
+            return current
+        entry = CachedLeaderboard(embed, version, computed_at)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def revalidate(
+        self, key: str, version: str, render: Render, listener: Listener | None = None
+    ) -> asyncio.Task:
+        """Render `key` in the background unless a render of this version is already running."""
+        inflight = self._inflight.get(key)
+        if inflight is not None and inflight[0] == version and not inflight[1].done():
+            task = inflight[1]
+        else:
+            self.revalidations += 1
+            task = asyncio.create_task(self._render(key, version, render))
+            task.add_done_callback(lambda t, k=key: self._on_render_done(k, t))
+            self._tasks.add(task)
+            self._inflight[key] = (version, task)
+            self._listeners[task] = []
+        if listener is not None:
+            self._listeners[task].append(listener)
+        return task
+
+    async def _render(self, key: str, version: str, render: Render) -> CachedLeaderboard:
+        started_at = time.time()
+        task = asyncio.current_task()
+        error: Exception | None = None
+        try:
+            entry = self.put(key, version, await render(), started_at)
+        except Exception as exc:
+            # Hand listeners the entry they are already showing so it stops reading as updating
+            error = exc
+            entry = self.get(key)
+        finally:
+            if self._inflight.get(key, (None, None))[1] is task:
+                del self._inflight[key]
+            listeners = self._listeners.pop(task, [])
+        if entry is not None:
+            for listener in listeners:
+                try:
+                    await listener(entry)
+                except Exception:
+                    log.exception("Leaderboard listener for %s failed", key)
+        if error is not None:
+            raise error
+        return entry
+
+    def _on_render_done(self, key: str, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            log.warning("Leaderboard render for %s failed: %s", key, task.exception())
+
+    async def stop(self) -> None:
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def memory_sources(self) -> dict:
+        return {
+            "entries": self._entries,
+            "revalidating": len(self._inflight),
+        }
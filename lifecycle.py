@@ -0,0 +1,126 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Iterable
+
+log = logging.getLogger(__name__)
+
+LifecycleHook = Callable[[str], Awaitable[None]]
+
+EVENTS = ("start", "end")
+
+
+class LifecycleScheduler:
+    """
+    Fire hooks when tournaments start and end.
+
+    Upcoming start and end times (Unix timestamps) sit in a min-heap and a
+    single task sleeps until the earliest one. Rescheduling a tournament
+    pushes new entries and leaves the old ones in place; they are skipped
+    when popped because they no longer match the tournament's current times.
+    Boundaries that passed while the bot was offline are not replayed.
+    """
+
+    def __init__(self, *, max_sleep: float = 3600.0) -> None:
+        # Re-check at least this often so wall clock jumps are noticed
+        self.max_sleep = max_sleep
+        self._heap: list[tuple[float, int, str, str]] = []
+        self._times: dict[str, dict[str, float]] = {}
+        self._hooks: dict[str, list[LifecycleHook]] = {event: [] for event in EVENTS}
+        self._counter = itertools.count()
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._firing: set[asyncio.Task] = set()
+
+    def add_hook(self, event: str, hook: LifecycleHook) -> None:
+        """Call `await hook(tournament_name)` whenever a tournament reaches `event`."""
+        if event not in self._hooks:
+            raise ValueError(f"Unknown lifecycle event '{event}'")
+        self._hooks[event].append(hook)
+
+    def schedule(self, name: str, start: float | None, end: float | None) -> None:
+        """Set (or replace) the times for `name`; times already in the past are ignored."""
+        now = time.time()
+        times = {
+            event: float(when)
+            for event, when in zip(EVENTS, (start, end))
+            if when is not None and float(when) > now
+        }
+        if times:
+            self._times[name] = times
+        else:
+            self._times.pop(name, None)
+        for event, when in times.items():
+            heapq.heappush(self._heap, (when, next(self._counter), event, name))
+        self._changed.set()
+
+    def cancel(self, name: str) -> None:
+        self._times.pop(name, None)
+        self._changed.set()
+
+    def load(self, tournaments: Iterable[dict], key: Callable[[dict], str] | None = None) -> None:
+        """Schedule each tournament under `key(tournament)`, its name by default."""
+        for tournament in tournaments:
+            try:
+                start = float(tournament.get("startDate"))
+                end = float(tournament.get("endDate"))
+            except (TypeError, ValueError):
+                continue
+            self.schedule(key(tournament) if key is not None else tournament.get("name", ""), start, end)
+
+    def next_due(self) -> tuple[float, str, str] | None:
+        """The earliest pending (time, event, name), dropping superseded entries."""
+        while self._heap:
+            when, _, event, name = self._heap[0]
+            if self._times.get(name, {}).get(event) == when:
+                return when, event, name
+            heapq.heappop(self._heap)
+        return None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._firing):
+            task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            self._changed.clear()
+            due = self.next_due()
+            delay = self.max_sleep if due is None else min(self.max_sleep, due[0] - time.time())
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            when, event, name = due
+            heapq.heappop(self._heap)
+            times = self._times.get(name, {})
+            times.pop(event, None)
+            if not times:
+                self._times.pop(name, None)
+            # Hooks may make API calls; don't let them delay the next boundary
+            task = asyncio.create_task(self._fire(event, name))
+            self._firing.add(task)
+            task.add_done_callback(self._firing.discard)
+
+    async def _fire(self, event: str, name: str) -> None:
+        log.info("Tournament '%s' reached %s", name, event)
+        for hook in self._hooks[event]:
+            try:
+                await hook(name)
+            except Exception:
+                log.exception("Lifecycle %s hook %r failed for tournament '%s'", event, hook, name)
@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import os
+import time
+
+import aiohttp
+
+import json_codec
+
+log = logging.getLogger(__name__)
+
+DEFAULT_URL = "wss://sockets.api.beatleader.xyz/scores"
+
+# (BeatLeader player id, upper-case map hash, difficulty, characteristic)
+ScoreKey = tuple[str, str, str, str]
+
+
+def score_key(player_id: str, map_config: dict) -> ScoreKey:
+    return (
+        str(player_id),
+        str(map_config.get("hash", "")).upper(),
+        str(map_config.get("difficulty", "")),
+        str(map_config.get("characteristic", "")),
+    )
+
+
+def _parse_score(payload: dict) -> tuple[ScoreKey, int, float | None] | None:
+    """Extract the key, score and accuracy (percent) from a BeatLeader score message."""
+    if not isinstance(payload, dict):
+        return None
+    # The general socket wraps scores as {"message": "upload", "data": {...}}
+    if "message" in payload and "data" in payload:
+        if payload["message"] not in ("upload", "accepted"):
+            return None
+        payload = payload["data"]
+        if not isinstance(payload, dict):
+            return None
+    leaderboard = payload.get("leaderboard")
+    song = leaderboard.get("song") if isinstance(leaderboard, dict) else None
+    difficulty = leaderboard.get("difficulty") if isinstance(leaderboard, dict) else None
+    if not isinstance(song, dict):
+        return None
+    if not isinstance(difficulty, dict):
+        difficulty = {}
+    score = payload.get("modifiedScore", payload.get("baseScore"))
+    if payload.get("playerId") is None or not song.get("hash") or not isinstance(score, (int, float)):
+        return None
+    accuracy = payload.get("accuracy")
+    key = (
+        str(payload["playerId"]),
+        str(song["hash"]).upper(),
+        str(difficulty.get("difficultyName", "")),
+        str(difficulty.get("modeName", "")),
+    )
+    return key, int(score), float(accuracy) * 100.0 if isinstance(accuracy, (int, float)) else None
+
+
+class LiveScoreFeed:
+    """
+    Local score snapshot kept current from BeatLeader's websocket score stream.
+
+    Only scores for tracked (player, map) pairs are kept; `track` registers
+    the pairs of a tournament. Renderers read `get` while the feed is
+    connected and fall back to polling otherwise, seeding the snapshot with
+    what they polled. The snapshot is dropped on disconnect because scores
+    set while offline were missed.
+
+    Enabled with BEATLEADER_LIVE_SCORES=1, see `from_env`.
+    """
+
+    def __init__(
+        self,
+        url: str = DEFAULT_URL,
+        *,
+        session: aiohttp.ClientSession | None = None,
+        reconnect_delay: float = 5.0,
+        max_reconnect_delay: float = 300.0,
+    ) -> None:
+        self.url = url
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connected = False
+        self.received = 0
+        self.matched = 0
+        self._session = session
+        self._owns_session = session is None
+        self._lookup: dict[ScoreKey, set[tuple[str, str, str]]] = {}
+        self._tracked: dict[str, set[ScoreKey]] = {}
+        self._scores: dict[ScoreKey, dict] = {}
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(cls) -> "LiveScoreFeed | None":
+        if os.getenv("BEATLEADER_LIVE_SCORES") != "1":
+            return None
+        return cls(os.getenv("BEATLEADER_SOCKET_URL", DEFAULT_URL))
+
+    def track(self, name: str, tournament: dict) -> None:
+        """Register (or refresh) the player/map pairs of `tournament`, tracked under `name`."""
+        for key in self._tracked.pop(name, set()):
+            targets = self._lookup.get(key)
+            if targets is not None:
+                targets.difference_update({target for target in targets if target[0] == name})
+                if not targets:
+                    del self._lookup[key]
+
+        keys: set[ScoreKey] = set()
+        for map_id, map_config in (tournament.get("maps") or {}).items():
+            if not (map_config or {}).get("hash"):
+                continue
+            for player_key, player in (tournament.get("players") or {}).items():
+                if not player.get("beatleaderId"):
+                    continue
+                key = score_key(player["beatleaderId"], map_config)
+                keys.add(key)
+                self._lookup.setdefault(key, set()).add((name, map_id, player_key))
+        self._tracked[name] = keys
+
+    def get(self, player_id: str, map_config: dict) -> dict | None:
+        """The snapshot for a pair, shaped like BeatLeaderClient.get_player_score_with_accuracy."""
+        if not self.connected:
+            return None
+        return self._scores.get(score_key(player_id, map_config))
+
+    def seed(self, player_id: str, map_config: dict, score: dict | None) -> None:
+        """Store a polled result so later renders can skip the request."""
+        if not self.connected:
+            return
+        key = score_key(player_id, map_config)
+        if key in self._lookup and key not in self._scores:
+            self._scores[key] = score if score is not None else {"score": None, "accuracy": None}
+
+    def handle(self, payload: dict) -> bool:
+        """Apply one stream message; returns whether it matched a tracked pair."""
+        self.received += 1
+        parsed = _parse_score(payload)
+        if parsed is None:
+            return False
+        key, score, accuracy = parsed
+        targets = self._lookup.get(key)
+        if not targets:
+            return False
+
+        current = self._scores.get(key)
+        if current is not None and isinstance(current.get("score"), (int, float)) and current["score"] >= score:
+            return False
+        self.matched += 1
+        # Score history is left to the render, which marks what improved since the last one
+        self._scores[key] = {"score": score, "accuracy": accuracy, "receivedAt": time.time()}
+        return True
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _run(self) -> None:
+        delay = self.reconnect_delay
+        while True:
+            if self._session is None or self._session.closed:
+                self._session = aiohttp.ClientSession()
+            try:
+                async with self._session.ws_connect(self.url, heartbeat=30) as socket:
+                    self.connected = True
+                    delay = self.reconnect_delay
+                    log.info("Connected to live score feed %s", self.url)
+                    async for message in socket:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            continue
+                        try:
+                            self.handle(json_codec.loads(message.data))
+                        except ValueError:
+                            log.debug("Ignoring malformed live score message")
+                        except Exception:
+                            # A message we can't handle must not end the feed
+                            log.exception("Failed to handle live score message")
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                log.warning("Live score feed error: %s", exc)
+            finally:
+                if self.connected:
+                    self.connected = False
+                    self._scores.clear()
+            log.info("Live score feed disconnected; reconnecting in %.0f s", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def memory_sources(self) -> dict:
+        return {"lookup": len(self._lookup), "scores": self._scores}
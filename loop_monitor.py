@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+log = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """
+    Measure event loop scheduling lag and report callbacks that block it.
+
+    A task sleeps `interval` seconds in a loop and records how late each
+    wake-up is. A watchdog thread checks the task's heartbeat; when the loop
+    has not run it for `block_threshold` seconds past its due time, the loop
+    thread's current stack is logged. Reports are rate limited to one every
+    `report_interval` seconds, with a count of those suppressed in between.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval: float = 0.1,
+        block_threshold: float = 0.25,
+        report_interval: float = 60.0,
+        window: int = 3000,
+    ) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.report_interval = report_interval
+        self.samples: deque[float] = deque(maxlen=window)
+        self.blocked_count = 0
+        self._heartbeat = time.monotonic()
+        self._last_report = 0.0
+        self._suppressed = 0
+        self._reported_heartbeat: float | None = None
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+            self._heartbeat = time.monotonic()
+
+    def _watch(self) -> None:
+        while not self._stop_event.wait(self.block_threshold / 2):
+            heartbeat = self._heartbeat
+            overdue = time.monotonic() - heartbeat - self.interval
+            if overdue < self.block_threshold or self._reported_heartbeat == heartbeat:
+                continue
+            # Report each blocked stretch once
+            self._reported_heartbeat = heartbeat
+            self.blocked_count += 1
+            self._report(overdue)
+
+    def _report(self, overdue: float) -> None:
+        now = time.monotonic()
+        if now - self._last_report < self.report_interval:
+            self._suppressed += 1
+            return
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<unavailable>\n"
+        suppressed = self._suppressed
+        self._last_report = now
+        self._suppressed = 0
+        log.warning(
+            "Event loop blocked for %.0f ms (%s earlier reports suppressed). Loop thread stack:\n%s",
+            overdue * 1000,
+            suppressed,
+            stack,
+        )
+
+    def percentiles(self) -> dict[str, float]:
+        """Return p50/p90/p99/max scheduling lag over the sample window, in seconds."""
+        if not self.samples:
+            return {"p50": 0.0, "p90": 0.0, "p99": 0.0, "max": 0.0}
+        ordered = sorted(self.samples)
+
+        def _at(fraction: float) -> float:
+            return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+        return {"p50": _at(0.50), "p90": _at(0.90), "p99": _at(0.99), "max": ordered[-1]}
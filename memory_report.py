@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import os
+import sys
+import time
+import tracemalloc
+import types
+from collections import deque
+from typing import Callable, Sized
+
+log = logging.getLogger(__name__)
+
+# A source returns metric name -> either a count or a container, which is
+# reported as its length and approximate deep size in bytes.
+MemorySource = Callable[[], dict[str, "int | Sized"]]
+
+_PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def deep_sizeof(obj: object) -> int:
+    """
+    Approximate bytes held by `obj` and the containers, values and instance
+    attributes it references. Classes, modules and functions are counted but
+    not followed.
+    """
+    seen: set[int] = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            stack.extend(current)
+        elif not isinstance(current, (type, types.ModuleType, types.FunctionType, types.MethodType)):
+            if hasattr(current, "__dict__"):
+                stack.append(vars(current))
+            for cls in type(current).__mro__:
+                slots = cls.__dict__.get("__slots__", ())
+                for slot in (slots,) if isinstance(slots, str) else slots:
+                    value = getattr(current, slot, None)
+                    if value is not None:
+                        stack.append(value)
+    return total
+
+
+def rss_bytes() -> int | None:
+    """Current resident set size, or None where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _subsystem(filename: str) -> str:
+    """Group a traced file by installed package, project module or "stdlib"."""
+    parts = filename.replace("\\", "/").split("/")
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            index = parts.index(marker)
+            if index + 1 < len(parts):
+                return parts[index + 1].removesuffix(".py")
+    if filename.startswith(_PROJECT_ROOT):
+        relative = os.path.relpath(filename, _PROJECT_ROOT).replace("\\", "/")
+        return relative.split("/")[0].removesuffix(".py")
+    return "stdlib"
+
+
+def format_bytes(value: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.1f} {unit}" if unit != "B" else f"{value:.0f} B"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+class MemoryReporter:
+    """
+    Periodic memory accounting by subsystem.
+
+    Every `interval` seconds this records RSS plus the counts and approximate
+    sizes reported by each registered source. Sources are read on the event
+    loop; sizing and the tracemalloc snapshot run in a worker thread. With `trace` enabled it also
+    takes a tracemalloc snapshot and attributes traced memory to packages and
+    project modules. A metric that grew in each of the last `trend_window`
+    reports is flagged as a growth trend and logged as a warning.
+    """
+
+    def __init__(self, *, interval: float = 300.0, trend_window: int = 6, trace: bool = False) -> None:
+        self.interval = interval
+        self.trend_window = trend_window
+        self.trace = trace
+        self.latest: dict[str, dict[str, int]] = {}
+        self.collected_at: float | None = None
+        self.trends: dict[str, tuple[int, int]] = {}
+        self._sources: dict[str, MemorySource] = {}
+        self._history: dict[str, deque[int]] = {}
+        self._task: asyncio.Task | None = None
+        self._started_tracemalloc = False
+
+    @classmethod
+    def from_env(cls) -> "MemoryReporter":
+        """Configured by MEMORY_REPORT_INTERVAL (seconds) and MEMORY_TRACEMALLOC=1."""
+        interval = float(os.getenv("MEMORY_REPORT_INTERVAL", "300"))
+        return cls(interval=interval, trace=os.getenv("MEMORY_TRACEMALLOC") == "1")
+
+    def register(self, name: str, source: MemorySource) -> None:
+        self._sources[name] = source
+
+    def start(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        if self.trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.collect()
+            except Exception:
+                log.exception("Memory report failed")
+            else:
+                self._log_report()
+            await asyncio.sleep(self.interval)
+
+    async def collect(self) -> dict[str, dict[str, int]]:
+        sources: dict[str, dict] = {}
+        for name, source in self._sources.items():
+            try:
+                sources[name] = source()
+            except Exception:
+                log.exception("Memory source %s failed", name)
+        report = await asyncio.to_thread(self._measure, sources)
+        self.latest = report
+        self.collected_at = time.time()
+        self._update_trends(report)
+        return report
+
+    def _measure(self, sources: dict[str, dict]) -> dict[str, dict[str, int]]:
+        report: dict[str, dict[str, int]] = {}
+        rss = rss_bytes()
+        if rss is not None:
+            report["process"] = {"rss_bytes": rss}
+
+        for name, values in sources.items():
+            section: dict[str, int] = {}
+            for metric, value in values.items():
+                if isinstance(value, int):
+                    section[metric] = value
+                    continue
+                try:
+                    section[metric] = len(value)
+                    section[f"{metric}_bytes"] = deep_sizeof(value)
+                except RuntimeError:
+                    # Changed size while being walked; measured again next time
+                    log.debug("Skipped %s.%s, it changed while being measured", name, metric)
+            report[name] = section
+
+        if tracemalloc.is_tracing():
+            by_subsystem: dict[str, int] = {}
+            snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            )
+            for stat in snapshot.statistics("filename"):
+                group = _subsystem(stat.traceback[0].filename)
+                by_subsystem[group] = by_subsystem.get(group, 0) + stat.size
+            report["tracemalloc"] = by_subsystem
+        return report
+
+    def _update_trends(self, report: dict[str, dict[str, int]]) -> None:
+        trends: dict[str, tuple[int, int]] = {}
+        for section, values in report.items():
+            for metric, value in values.items():
+                key = f"{section}.{metric}"
+                history = self._history.setdefault(key, deque(maxlen=self.trend_window + 1))
+                history.append(value)
+                if len(history) == history.maxlen and all(
+                    later > earlier for earlier, later in zip(history, list(history)[1:])
+                ):
+                    trends[key] = (history[0], history[-1])
+        # Forget metrics that no longer exist
+        current = {f"{section}.{metric}" for section, values in report.items() for metric in values}
+        for key in set(self._history) - current:
+            del self._history[key]
+        self.trends = trends
+
+    def _log_report(self) -> None:
+        lines = []
+        for section, values in self.latest.items():
+            parts = [
+                f"{metric}={format_bytes(value) if metric.endswith('bytes') or section == 'tracemalloc' else value}"
+                for metric, value in sorted(values.items())
+            ]
+            lines.append(f"  {section}: {', '.join(parts)}")
+        log.info("Memory report:\n%s", "\n".join(lines))
+        for key, (first, last) in self.trends.items():
+            log.warning(
+                "%s grew in each of the last %d memory reports (%s -> %s)",
+                key,
+                self.trend_window,
+                first,
+                last,
+            )
+
+    def summary(self, limit: int = 3) -> str:
+        """Short text for /status from the latest report: RSS, largest subsystems and any growth trends."""
+        if not self.latest:
+            return "No report collected yet"
+        lines = []
+        rss = self.latest.get("process", {}).get("rss_bytes")
+        if rss is not None:
+            lines.append(f"RSS {format_bytes(rss)}")
+        sizes = [
+            (sum(value for metric, value in values.items() if metric.endswith("_bytes")), section)
+            for section, values in self.latest.items()
+            if section not in ("process", "tracemalloc")
+        ]
+        largest = [f"{section} {format_bytes(size)}" for size, section in sorted(sizes, reverse=True)[:limit] if size]
+        if largest:
+            lines.append("Largest: " + ", ".join(largest))
+        views = self.latest.get("views", {}).get("total")
+        if views is not None:
+            lines.append(f"{views} live views")
+        if self.trends:
+            lines.append("Growing: " + ", ".join(sorted(self.trends)[:limit]))
+        return "\n".join(lines)
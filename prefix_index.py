@@ -0,0 +1,63 @@
+from bisect import bisect_left, insort
+from typing import Iterable
+
+
+class PrefixIndex:
+    """
+    Case-insensitive prefix search over names.
+
+    A query matches a name when it is a prefix of the name or of any word in
+    it, so "cup" finds "Summer Cup". Each name maps to a value (e.g. a
+    tournament name or a player key); lookups are a bisect into a sorted list.
+    """
+
+    def __init__(self, items: Iterable[tuple[str, str]] = ()) -> None:
+        self._entries: list[tuple[str, str, str]] = []
+        self._names: list[tuple[str, str, str]] = []
+        for name, value in items:
+            self._add_entries(name, value)
+        self._entries.sort()
+        self._names.sort()
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @staticmethod
+    def _suffixes(name: str) -> set[str]:
+        lowered = name.lower()
+        suffixes = {lowered}
+        for index, char in enumerate(lowered):
+            if index and char.isalnum() and not lowered[index - 1].isalnum():
+                suffixes.add(lowered[index:])
+        return suffixes
+
+    def _add_entries(self, name: str, value: str) -> None:
+        self._names.append((name.lower(), name, value))
+        for suffix in self._suffixes(name):
+            self._entries.append((suffix, name, value))
+
+    def add(self, name: str, value: str) -> None:
+        insort(self._names, (name.lower(), name, value))
+        for suffix in self._suffixes(name):
+            insort(self._entries, (suffix, name, value))
+
+    def search(self, prefix: str, limit: int = 25) -> list[tuple[str, str]]:
+        """Return up to `limit` (name, value) pairs matching `prefix`, names starting with it first."""
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return [(name, value) for _, name, value in self._names[:limit]]
+
+        results: list[tuple[str, str]] = []
+        seen: set[str] = set()
+        # Whole-name matches first, then matches on a later word
+        for entries in (self._names, self._entries):
+            position = bisect_left(entries, (prefix,))
+            while position < len(entries) and len(results) < limit:
+                key, name, value = entries[position]
+                if not key.startswith(prefix):
+                    break
+                if value not in seen:
+                    seen.add(value)
+                    results.append((name, value))
+                position += 1
+        return results
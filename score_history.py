@@ -0,0 +1,154 @@
+import json
+import os
+import time
+
+import numpy as np
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("tournament", "<u4"),
+        ("player", "<u4"),
+        ("map", "<u4"),
+        ("timestamp", "<f8"),
+        ("score", "<f8"),
+        ("accuracy", "<f4"),
+    ]
+)
+
+
+class ScoreHistory:
+    """
+    Append-only score history stored as fixed-width binary records.
+
+    Tournament names, player keys and map ids are interned to integer ids kept
+    in a small JSON sidecar, so each record is RECORD_DTYPE.itemsize bytes.
+    A record is only appended when a cell's score differs from the last one
+    recorded for it. The last score per cell is rebuilt from the memory-mapped
+    records file the first time a tournament is recorded, with a vectorized
+    pass over that tournament's records only.
+    """
+
+    CHUNK_SIZE = 65536
+
+    def __init__(self, directory: str = "score_history") -> None:
+        self.directory = directory
+        self.records_path = os.path.join(directory, "records.bin")
+        self.keys_path = os.path.join(directory, "keys.json")
+        self._keys: list[str] = []
+        self._key_ids: dict[str, int] = {}
+        self._latest: dict[tuple[int, int, int], float] = {}
+        self._loaded = False
+        self._loaded_tournaments: set[int] = set()
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            with open(self.keys_path, "r", encoding="utf-8") as file:
+                self._keys = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._keys = []
+        self._key_ids = {key: index for index, key in enumerate(self._keys)}
+
+    def _load_tournament(self, tournament_id: int) -> None:
+        """Fill `_latest` for one tournament from its records."""
+        if tournament_id in self._loaded_tournaments:
+            return
+        self._loaded_tournaments.add(tournament_id)
+        records = self._records()
+        matches: list[np.ndarray] = []
+        for start in range(0, len(records), self.CHUNK_SIZE):
+            chunk = records[start:start + self.CHUNK_SIZE]
+            matched = chunk[chunk["tournament"] == tournament_id]
+            if len(matched):
+                matches.append(np.array(matched[["player", "map", "score"]]))
+        if not matches:
+            return
+        rows = np.concatenate(matches)
+        cells = (rows["player"].astype(np.uint64) << np.uint64(32)) | rows["map"].astype(np.uint64)
+        # The last record of each cell is its first occurrence in reverse
+        _, last = np.unique(cells[::-1], return_index=True)
+        latest = rows[::-1][last]
+        for player, map_id, score in zip(
+            latest["player"].tolist(), latest["map"].tolist(), latest["score"].tolist()
+        ):
+            self._latest[(tournament_id, player, map_id)] = score
+
+    def _records(self) -> np.ndarray:
+        try:
+            size = os.path.getsize(self.records_path)
+        except FileNotFoundError:
+            size = 0
+        # Ignore a trailing partial record left by an interrupted write.
+        count = size // RECORD_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.memmap(self.records_path, dtype=RECORD_DTYPE, mode="r", shape=(count,))
+
+    def _intern(self, key: str) -> int:
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = len(self._keys)
+            self._keys.append(key)
+            self._key_ids[key] = key_id
+        return key_id
+
+    def memory_sources(self) -> dict:
+        return {"keys": self._keys, "key_ids": self._key_ids, "latest": self._latest}
+
+    def _save_keys(self) -> None:
+        with open(self.keys_path, "w", encoding="utf-8") as file:
+            json.dump(self._keys, file)
+
+    def record(
+        self,
+        tournament: str,
+        map_id: str,
+        entries: list[tuple[str, float | int | None, float | None]],
+        timestamp: float | None = None,
+    ) -> set[str]:
+        """
+        Record the current (player, score, accuracy) entries for one map.
+
+        Entries without a score are ignored. Returns the players whose score
+        went up since the previous recorded value.
+        """
+        self._load()
+        timestamp = time.time() if timestamp is None else timestamp
+        key_count = len(self._keys)
+        tournament_id = self._intern(tournament)
+        map_key_id = self._intern(map_id)
+        self._load_tournament(tournament_id)
+
+        rows: list[tuple] = []
+        improved: set[str] = set()
+        for player, score, accuracy in entries:
+            if score is None:
+                continue
+            player_id = self._intern(player)
+            cell = (tournament_id, player_id, map_key_id)
+            previous = self._latest.get(cell)
+            if previous == score:
+                continue
+            if previous is not None and score > previous:
+                improved.add(player)
+            self._latest[cell] = float(score)
+            rows.append(
+                (
+                    tournament_id,
+                    player_id,
+                    map_key_id,
+                    timestamp,
+                    score,
+                    np.nan if accuracy is None else accuracy,
+                )
+            )
+
+        if len(self._keys) != key_count:
+            self._save_keys()
+        if rows:
+            with open(self.records_path, "ab") as file:
+                file.write(np.array(rows, dtype=RECORD_DTYPE).tobytes())
+        return improved
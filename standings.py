@@ -0,0 +1,122 @@
+import numpy as np
+
+METHODS = ("total", "average", "points")
+
+
+class ScoreMatrix:
+    """
+    Players x maps table of scores and accuracies.
+
+    Rows follow the order of `players`, columns the order of `maps`.
+    Cells without a score are NaN in both arrays.
+    """
+
+    def __init__(self, players: list[str], maps: list[str]) -> None:
+        self.players = list(players)
+        self.maps = list(maps)
+        self._player_index = {player: row for row, player in enumerate(self.players)}
+        self._map_index = {map_id: column for column, map_id in enumerate(self.maps)}
+        shape = (len(self.players), len(self.maps))
+        self.scores = np.full(shape, np.nan, dtype=np.float64)
+        self.accuracy = np.full(shape, np.nan, dtype=np.float64)
+
+    def set(self, player: str, map_id: str, score: float | int | None, accuracy: float | None) -> None:
+        row = self._player_index[player]
+        column = self._map_index[map_id]
+        self.scores[row, column] = np.nan if score is None else score
+        self.accuracy[row, column] = np.nan if accuracy is None else accuracy
+
+
+def _best_n(values: np.ndarray, best_n: int | None) -> np.ndarray:
+    """Keep each row's `best_n` highest values and set the rest to NaN."""
+    if best_n is None or best_n >= values.shape[1]:
+        return values
+    if best_n <= 0:
+        return np.full_like(values, np.nan)
+    # Sort descending with missing cells last, then drop everything past best_n.
+    ordered = -np.sort(np.where(np.isnan(values), np.inf, -values), axis=1)
+    ordered[:, best_n:] = np.nan
+    ordered[np.isinf(ordered)] = np.nan
+    return ordered
+
+
+def map_ranks(scores: np.ndarray) -> np.ndarray:
+    """
+    1-based placement of each cell within its map (column), highest score
+    first. Tied scores share the better placement. Missing cells are NaN.
+    """
+    rows, columns = scores.shape
+    missing = np.isnan(scores)
+    # Descending order with missing cells pushed to the end of each column.
+    keys = np.where(missing, np.inf, -scores)
+    order = np.argsort(keys, axis=0)
+    ordered = np.take_along_axis(keys, order, axis=0)
+
+    # Position of the first entry of each run of equal values, so ties share a rank.
+    positions = np.arange(rows)[:, None]
+    starts = np.ones_like(ordered, dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    tied_ranks = np.maximum.accumulate(np.where(starts, positions, 0), axis=0)
+
+    ranks = np.empty(scores.shape, dtype=np.float64)
+    ranks[order, np.arange(columns)] = tied_ranks + 1
+    ranks[missing] = np.nan
+    return ranks
+
+
+def placement_points(scores: np.ndarray) -> np.ndarray:
+    """
+    Award points per map by placement: with k players scoring on a map, first
+    place gets k points and last place gets 1. Tied scores share the better
+    placement. Missing cells are NaN.
+    """
+    return (~np.isnan(scores)).sum(axis=0) - map_ranks(scores) + 1
+
+
+def standings_options(tournament: dict) -> tuple[str, int | None]:
+    """A tournament's (method, best_n), falling back to "total" over all maps for missing or invalid values."""
+    method = tournament.get("standingsMethod")
+    if not isinstance(method, str) or method not in METHODS:
+        method = "total"
+    best_n = tournament.get("standingsBestN")
+    if not isinstance(best_n, int) or isinstance(best_n, bool) or best_n <= 0:
+        best_n = None
+    return method, best_n
+
+
+def compute_standings(
+    matrix: ScoreMatrix, method: str = "total", best_n: int | None = None
+) -> list[tuple[str, float, int]]:
+    """
+    Rank players over all maps.
+
+    Methods:
+    - "total": sum of accuracy over the counted maps
+    - "average": mean accuracy over the counted maps
+    - "points": sum of placement points over the counted maps
+
+    `best_n` limits each player to their N best maps. Returns
+    (player, value, maps_played) tuples, best first; players with no scores
+    are left out.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown standings method '{method}'.")
+    if not matrix.players or not matrix.maps:
+        return []
+
+    values = placement_points(matrix.scores) if method == "points" else matrix.accuracy
+    counted = _best_n(values, best_n)
+    played = (~np.isnan(counted)).sum(axis=1)
+    totals = np.nansum(counted, axis=1)
+    if method == "average":
+        totals = np.divide(totals, played, out=np.zeros_like(totals), where=played > 0)
+
+    order = np.argsort(-totals, kind="stable")
+    order = order[played[order] > 0]
+    return list(
+        zip(
+            [matrix.players[row] for row in order.tolist()],
+            totals[order].tolist(),
+            played[order].tolist(),
+        )
+    )
@@ -0,0 +1,89 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Iterable
+
+log = logging.getLogger(__name__)
+
+WarmupJob = Callable[["CacheWarmer"], Awaitable[None]]
+
+
+class CacheWarmer:
+    """
+    Background cache warm-up run once after startup.
+
+    Modules add jobs in setup(); `start` runs them after `start_delay`
+    seconds so the gateway connection and the first interactions go first.
+    Jobs pass their individual fetches to `run_limited`, which shares a
+    budget of `concurrency` in-flight fetches across all jobs. Failures are
+    logged and counted, never raised.
+    """
+
+    def __init__(self, *, concurrency: int = 4, start_delay: float = 5.0) -> None:
+        self.concurrency = concurrency
+        self.start_delay = start_delay
+        self.completed = 0
+        self.failed = 0
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+        self._jobs: dict[str, WarmupJob] = {}
+        self._budget = asyncio.Semaphore(concurrency)
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(cls) -> "CacheWarmer":
+        """Configured by WARMUP_CONCURRENCY (0 disables the warm-up) and WARMUP_DELAY (seconds)."""
+        return cls(
+            concurrency=int(os.getenv("WARMUP_CONCURRENCY", "4")),
+            start_delay=float(os.getenv("WARMUP_DELAY", "5")),
+        )
+
+    def add_job(self, name: str, job: WarmupJob) -> None:
+        self._jobs[name] = job
+
+    async def run_limited(self, fetches: Iterable[Callable[[], Awaitable[object]]]) -> None:
+        """Await each fetch under the shared concurrency budget."""
+
+        async def _one(fetch: Callable[[], Awaitable[object]]) -> None:
+            async with self._budget:
+                try:
+                    await fetch()
+                except Exception as exc:
+                    self.failed += 1
+                    log.debug("Warm-up fetch failed: %s", exc)
+                else:
+                    self.completed += 1
+
+        await asyncio.gather(*(_one(fetch) for fetch in fetches))
+
+    def start(self) -> None:
+        if self.concurrency <= 0 or not self._jobs:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self.start_delay)
+        self.started_at = time.monotonic()
+        for name, job in self._jobs.items():
+            try:
+                await job(self)
+            except Exception:
+                log.exception("Warm-up job %s failed", name)
+        self.finished_at = time.monotonic()
+        log.info(
+            "Cache warm-up finished in %.1f s: %d fetches, %d failed",
+            self.finished_at - self.started_at,
+            self.completed,
+            self.failed,
+        )